@@ -1,21 +1,48 @@
 """
 百炼 LiveTranslate ASR 引擎
 基于 qwen3-livetranslate-flash-realtime 模型
-使用原生 WebSocket 调用（官方推荐方式）
+使用原生 WebSocket 调用（官方推荐方式），asyncio + websockets 实现
 """
 
 import os
 import json
-import base64
+import asyncio
 import logging
 import threading
+from functools import partial
 from dataclasses import dataclass
 from typing import Callable, Optional
 
-import websocket
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.exceptions import ConnectionClosedOK
+
+try:
+    from pybase64 import b64encode
+except ImportError:  # pybase64 可选：缺失时使用标准库 base64
+    from base64 import b64encode
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson 可选：缺失时使用标准库 json
+    _json_loads = json.loads
+
+from core.ring_buffer import RingBuffer
+from core.thread_priority import raise_thread_priority
 
 logger = logging.getLogger(__name__)
 
+# LiveTranslate 协议事件类型
+EVT_SESSION_UPDATE = "session.update"
+EVT_SESSION_CREATED = "session.created"
+EVT_SESSION_UPDATED = "session.updated"
+EVT_SPEECH_STARTED = "input_audio_buffer.speech_started"
+EVT_SPEECH_STOPPED = "input_audio_buffer.speech_stopped"
+EVT_TRANSCRIPT_PARTIAL = "conversation.item.input_audio_transcription.text"
+EVT_TRANSCRIPT_FINAL = "conversation.item.input_audio_transcription.completed"
+EVT_TRANSLATION_PARTIAL = "response.text.delta"
+EVT_TRANSLATION_FINAL = "response.text.done"
+EVT_ERROR = "error"
+
 
 @dataclass
 class TranslationResult:
@@ -31,19 +58,68 @@ class ASRTranslator:
     """
     百炼 LiveTranslate ASR+翻译引擎
     使用 qwen3-livetranslate-flash-realtime 模型
-    原生 WebSocket 实现
+    原生 WebSocket 实现：后台线程运行 asyncio 事件循环，发送/接收协程并发，
+    采集线程只把 PCM 写入 SPSC 环形缓冲区，不会被网络发送阻塞
     """
 
-    def __init__(self, config: dict):
+    # 待发送音频上限（按 100ms 音频块计）：网络跟不上时覆盖最旧音频，
+    # 宁可丢帧也不积压，端到端延迟最多增加 MAX_PENDING_CHUNKS * 100ms
+    MAX_PENDING_CHUNKS = 8
+
+    # 中间结果合并间隔（秒）：约一帧 60Hz，期间的原文/译文增量合并为一次回调
+    PARTIAL_FLUSH_INTERVAL = 0.016
+
+    def __init__(self, config: dict, channel_name: str = "main"):
         self.config = config
-        self.ws: Optional[websocket.WebSocketApp] = None
-        self._is_running = False
+        self.channel_name = channel_name    # 随结果一起回调，调用方无需再包一层闭包
+        self.ws: Optional[ClientConnection] = None
+        self._running = threading.Event()
         self._lock = threading.Lock()
         self._ws_thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._ring: Optional[RingBuffer] = None
+        self._data_ready: Optional[asyncio.Event] = None
+        # (写入环形缓冲区, 唤醒发送协程)，运行期间有效；采集线程只读这一个属性
+        self._audio_sink: Optional[tuple] = None
         self._on_result: Optional[Callable] = None
         self._target_lang = "en"
         self._session_id = None
 
+        # 待合并的中间结果：原文取最新整句，译文增量按序拼接（仅事件循环线程访问）
+        self._pending_src = ""
+        self._pending_tr = ""
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        # input_audio_buffer.append 事件的固定 JSON 外壳，发送时只拼接 base64 音频
+        self._audio_prefix = b'{"type":"input_audio_buffer.append","audio":"'
+        self._audio_suffix = b'"}'
+
+        # 原始 PCM 以二进制帧发送，省去 base64 编码（需服务端支持）
+        self._binary_audio = config.get("dashscope", {}).get("binary_audio", False)
+
+        # 服务端事件分发表：event type → 处理函数
+        self._handlers = {
+            EVT_SESSION_CREATED: self._h_session_created,
+            EVT_SESSION_UPDATED: self._h_session_updated,
+            EVT_SPEECH_STARTED: self._h_speech_started,
+            EVT_SPEECH_STOPPED: self._h_speech_stopped,
+            EVT_TRANSCRIPT_PARTIAL: self._h_transcript_partial,
+            EVT_TRANSCRIPT_FINAL: self._h_transcript_final,
+            EVT_TRANSLATION_PARTIAL: self._h_translation_partial,
+            EVT_TRANSLATION_FINAL: self._h_translation_final,
+            EVT_ERROR: self._h_error,
+        }
+
+        # 每个音频块的字节数：100ms 的 16bit 单声道 PCM
+        sample_rate = config.get("audio", {}).get("sample_rate", 16000)
+        self._chunk_bytes = sample_rate // 10 * 2
+
+        # 发送合并：攒够 send_interval_ms 的音频（或等待超时）再发一帧，减少每帧开销
+        send_interval_ms = config.get("dashscope", {}).get("send_interval_ms", 200)
+        self._send_interval = send_interval_ms / 1000
+        self._send_bytes = max(self._chunk_bytes, sample_rate * 2 * send_interval_ms // 1000)
+
         # API Key
         api_key = config.get("dashscope", {}).get("api_key", "")
         if not api_key:
@@ -60,53 +136,122 @@ class ASRTranslator:
         )
         return f"{base_url}?model={model}"
 
-    def start(self, target_lang: str, on_result: Callable[[TranslationResult], None]):
-        """启动 ASR + 翻译"""
+    def start(self, target_lang: str, on_result: Callable[[str, TranslationResult], None]):
+        """启动 ASR + 翻译，结果以 on_result(channel_name, result) 回调"""
         with self._lock:
-            if self._is_running:
+            if self._running.is_set():
                 logger.warning("ASR Translator already running")
                 return
 
             self._target_lang = target_lang
             self._on_result = on_result
-            self._is_running = True
+            self._pending_src = self._pending_tr = ""
+            self._flush_handle = None
+            self._running.set()
 
-        url = self._build_url()
-        headers = [f"Authorization: Bearer {self._api_key}"]
-
-        self.ws = websocket.WebSocketApp(
-            url,
-            header=headers,
-            on_open=self._on_open,
-            on_message=self._on_message,
-            on_error=self._on_error,
-            on_close=self._on_close,
-        )
+            self._loop = asyncio.new_event_loop()
+            self._ring = RingBuffer(max(self.MAX_PENDING_CHUNKS * self._chunk_bytes, self._send_bytes))
+            self._data_ready = asyncio.Event()
+            self._task = self._loop.create_task(self._session())
+            self._audio_sink = (self._ring.write, partial(self._loop.call_soon_threadsafe, self._data_ready.set))
 
-        self._ws_thread = threading.Thread(target=self._run_ws, daemon=True)
+        self._ws_thread = threading.Thread(target=self._run_loop, args=(self._loop, self._task), daemon=True)
         self._ws_thread.start()
         logger.info(f"ASR Translator starting (target_lang={target_lang})")
 
-    def _run_ws(self):
-        """运行 WebSocket 事件循环"""
+    def _run_loop(self, loop: asyncio.AbstractEventLoop, task: asyncio.Task):
+        """运行 asyncio 事件循环（后台线程）"""
+        raise_thread_priority("asr-websocket")
+        asyncio.set_event_loop(loop)
         try:
-            self.ws.run_forever()
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
             logger.error(f"WebSocket run error: {e}")
         finally:
-            self._is_running = False
+            # 仅在未被 stop()/重新 start() 接管时复位状态
+            if self._loop is loop:
+                self._running.clear()
+                self._audio_sink = None
+            loop.close()
+
+    async def _session(self):
+        """建立连接，并发运行发送协程与接收协程，任一结束即关闭会话"""
+        url = self._build_url()
+        headers = {"Authorization": f"Bearer {self._api_key}"}
+
+        ws = None
+        try:
+            async with connect(url, additional_headers=headers, close_timeout=1) as ws:
+                self.ws = ws
+                await self._on_open(ws)
 
-    def _on_open(self, ws):
+                sender = asyncio.ensure_future(self._sender(ws, self._ring, self._data_ready))
+                receiver = asyncio.ensure_future(self._receiver(ws))
+                try:
+                    done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+                    for t in done:
+                        t.result()
+                finally:
+                    sender.cancel()
+                    receiver.cancel()
+        finally:
+            self.ws = None
+            if ws is not None:
+                logger.info(f"WebSocket closed: code={ws.close_code}, msg={ws.close_reason}")
+
+    async def _sender(self, ws: ClientConnection, ring: RingBuffer, data_ready: asyncio.Event):
+        """
+        发送协程：合并环形缓冲区中的音频后发送
+        每帧攒够 send_bytes 字节，或自开始等待起超过 send_interval 秒即发送
+        """
+        loop = asyncio.get_running_loop()
+        send_bytes, interval = self._send_bytes, self._send_interval
+        buf = bytearray(send_bytes)
+        view = memoryview(buf)
+        prefix, suffix = self._audio_prefix, self._audio_suffix
+        binary = self._binary_audio
+        while True:
+            if not ring.available:
+                await data_ready.wait()
+            data_ready.clear()
+
+            deadline = loop.time() + interval
+            while ring.available < send_bytes:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(data_ready.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                data_ready.clear()
+
+            n = ring.read_into(buf)
+            if not n:
+                continue
+            if binary:
+                await ws.send(bytes(view[:n]))
+            else:
+                await ws.send(prefix + b64encode(view[:n]) + suffix, text=True)
+
+    async def _receiver(self, ws: ClientConnection):
+        """接收协程：分发服务端消息（不做 UTF-8 解码，原始 bytes 直接交给 JSON 解析）"""
+        try:
+            while True:
+                self._on_message(await ws.recv(decode=False))
+        except ConnectionClosedOK:
+            pass
+
+    async def _on_open(self, ws: ClientConnection):
         """WebSocket 连接建立"""
         logger.info("LiveTranslate WebSocket connected")
 
         # 发送 session.update 配置翻译参数
-        audio_config = self.config.get("audio", {})
-        model_config = self.config.get("model", {})
-
         update_event = {
             "event_id": "evt_update_session",
-            "type": "session.update",
+            "type": EVT_SESSION_UPDATE,
             "session": {
                 "modalities": ["text"],
                 "input_audio_format": "pcm16",
@@ -118,108 +263,146 @@ class ASRTranslator:
                 },
             }
         }
-        ws.send(json.dumps(update_event))
+        await ws.send(json.dumps(update_event))
         logger.info(f"Session update sent (target={self._target_lang})")
 
-    def _on_message(self, ws, message):
-        """处理服务端消息"""
+    def _on_message(self, message):
+        """处理服务端消息：按事件类型查表分发"""
         try:
-            data = json.loads(message)
-            event_type = data.get("type", "")
-
-            if event_type == "session.created":
-                self._session_id = data.get("session", {}).get("id", "")
-                logger.info(f"Session created: {self._session_id}")
-
-            elif event_type == "session.updated":
-                logger.info("Session updated successfully")
-
-            elif event_type == "input_audio_buffer.speech_started":
-                logger.debug("Speech started")
-
-            elif event_type == "input_audio_buffer.speech_stopped":
-                logger.debug("Speech stopped")
-
-            elif event_type == "conversation.item.input_audio_transcription.text":
-                # 原文中间识别结果（流式）
-                stash = data.get("stash", "")
-                if stash and self._on_result:
-                    self._on_result(TranslationResult(
-                        source_text=stash,
-                        translated_text="",
-                        source_lang="auto",
-                        target_lang=self._target_lang,
-                        is_final=False,
-                    ))
-
-            elif event_type == "conversation.item.input_audio_transcription.completed":
-                # 原文最终识别结果
-                transcript = data.get("transcript", "")
-                if transcript and self._on_result:
-                    self._on_result(TranslationResult(
-                        source_text=transcript,
-                        translated_text="",
-                        source_lang="auto",
-                        target_lang=self._target_lang,
-                        is_final=True,
-                    ))
-
-            elif event_type == "response.text.done":
-                # 翻译最终结果
-                text = data.get("text", "")
-                if text and self._on_result:
-                    self._on_result(TranslationResult(
-                        source_text="",
-                        translated_text=text,
-                        source_lang="auto",
-                        target_lang=self._target_lang,
-                        is_final=True,
-                    ))
-
-            elif event_type == "response.text.delta":
-                # 翻译中间结果（流式）
-                delta = data.get("delta", "")
-                if delta and self._on_result:
-                    self._on_result(TranslationResult(
-                        source_text="",
-                        translated_text=delta,
-                        source_lang="auto",
-                        target_lang=self._target_lang,
-                        is_final=False,
-                    ))
-
-            elif event_type == "error":
-                error_msg = data.get("error", {}).get("message", str(data))
-                logger.error(f"Server error: {error_msg}")
-
+            data = _json_loads(message)
+            handler = self._handlers.get(data.get("type"))
+            if handler:
+                handler(data)
         except Exception as e:
-            logger.error(f"Message parse error: {e}")
+            logger.error("Message parse error: %s", e)
+
+    def _emit_result(self, source_text: str, translated_text: str, is_final: bool):
+        if self._on_result:
+            self._on_result(self.channel_name, TranslationResult(
+                source_text=source_text,
+                translated_text=translated_text,
+                source_lang="auto",
+                target_lang=self._target_lang,
+                is_final=is_final,
+            ))
+
+    def _queue_partial(self, source_text: str = "", translated_text: str = ""):
+        """缓存中间结果，PARTIAL_FLUSH_INTERVAL 内的多次更新合并为一次回调"""
+        if source_text:
+            self._pending_src = source_text
+        if translated_text:
+            self._pending_tr += translated_text
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.PARTIAL_FLUSH_INTERVAL, self._flush_partial
+            )
+
+    def _flush_partial(self):
+        """立即发出已缓存的中间结果（定时触发，或最终结果到达前调用以保证顺序）"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        source_text, translated_text = self._pending_src, self._pending_tr
+        if source_text or translated_text:
+            self._pending_src = self._pending_tr = ""
+            self._emit_result(source_text, translated_text, is_final=False)
+
+    def _h_session_created(self, data: dict):
+        self._session_id = data.get("session", {}).get("id", "")
+        logger.info(f"Session created: {self._session_id}")
+
+    def _h_session_updated(self, data: dict):
+        logger.info("Session updated successfully")
+
+    # VAD 事件频繁且运行在网络线程上，DEBUG 未开启时连日志调用本身也跳过
+    def _h_speech_started(self, data: dict):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Speech started")
+
+    def _h_speech_stopped(self, data: dict):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Speech stopped")
+
+    def _h_transcript_partial(self, data: dict):
+        """原文中间识别结果（流式）"""
+        stash = data.get("stash", "")
+        if stash:
+            self._queue_partial(source_text=stash)
+
+    def _h_transcript_final(self, data: dict):
+        """原文最终识别结果"""
+        transcript = data.get("transcript", "")
+        if transcript:
+            self._flush_partial()
+            self._emit_result(transcript, "", is_final=True)
+
+    def _h_translation_partial(self, data: dict):
+        """翻译中间结果（流式）"""
+        delta = data.get("delta", "")
+        if delta:
+            self._queue_partial(translated_text=delta)
+
+    def _h_translation_final(self, data: dict):
+        """翻译最终结果"""
+        text = data.get("text", "")
+        if text:
+            self._flush_partial()
+            self._emit_result("", text, is_final=True)
+
+    def _h_error(self, data: dict):
+        error = data.get("error")
+        if error and "message" in error:
+            logger.error("Server error: %s", error["message"])
+        else:
+            logger.error("Server error: %r", data)  # 由 logging 按需格式化
 
-    def _on_error(self, ws, error):
-        """WebSocket 错误"""
-        logger.error(f"WebSocket error: {error}")
+    def send_audio(self, audio_data: bytes):
+        """发送音频数据：写入环形缓冲区并唤醒发送协程（由采集线程调用）"""
+        sink = self._audio_sink
+        if sink is None:
+            return
+        write, wake = sink
+        write(audio_data)
+        try:
+            wake()
+        except RuntimeError:
+            pass  # 事件循环已关闭
 
-    def _on_close(self, ws, close_status_code, close_msg):
-        """WebSocket 关闭"""
-        logger.info(f"WebSocket closed: code={close_status_code}, msg={close_msg}")
-        self._is_running = False
+    def update_target_lang(self, target_lang: str) -> bool:
+        """在现有连接上发送 session.update 切换目标语言，成功返回 True"""
+        loop, ws = self._loop, self.ws
+        if not (self._running.is_set() and loop and ws):
+            return False
 
-    def send_audio(self, audio_data: bytes):
-        """发送音频数据（PCM bytes → base64）"""
-        if self._is_running and self.ws and self.ws.sock and self.ws.sock.connected:
-            try:
-                audio_b64 = base64.b64encode(audio_data).decode("utf-8")
-                event = {
-                    "type": "input_audio_buffer.append",
-                    "audio": audio_b64,
-                }
-                self.ws.send(json.dumps(event))
-            except Exception as e:
-                logger.error(f"Send audio error: {e}")
+        update_event = {
+            "type": EVT_SESSION_UPDATE,
+            "session": {
+                "translation": {
+                    "language": target_lang,
+                },
+            }
+        }
+        try:
+            future = asyncio.run_coroutine_threadsafe(ws.send(json.dumps(update_event)), loop)
+            future.result(timeout=1)
+        except Exception as e:
+            logger.warning(f"In-place language switch failed: {e}")
+            return False
+
+        self._target_lang = target_lang
+        logger.info(f"Session update sent (target={target_lang})")
+        return True
 
     def switch_language(self, target_lang: str):
-        """切换目标语言（重建连接）"""
-        on_result = self._on_result
+        """切换目标语言：优先在现有连接上更新会话，失败时重建连接"""
+        if self.update_target_lang(target_lang):
+            return
+
+        # 更新失败也可能是因为会话已被 stop()：已停止时不得重建连接
+        with self._lock:
+            if not self._running.is_set():
+                return
+            on_result = self._on_result
         self.stop()
         if on_result:
             self.start(target_lang=target_lang, on_result=on_result)
@@ -227,15 +410,34 @@ class ASRTranslator:
     def stop(self):
         """停止"""
         with self._lock:
-            self._is_running = False
-            if self.ws:
-                try:
-                    self.ws.close()
-                except Exception:
-                    pass
-                self.ws = None
-            logger.info("ASR Translator stopped")
+            self._running.clear()
+            self._audio_sink = None
+            loop, task, thread = self._loop, self._task, self._ws_thread
+            self._loop = self._task = self._ws_thread = None
+
+        if loop and task:
+            try:
+                loop.call_soon_threadsafe(self._shutdown, task)
+            except RuntimeError:
+                pass  # 事件循环已退出
+        if thread:
+            thread.join(timeout=3)
+        logger.info("ASR Translator stopped")
+
+    def _shutdown(self, task: asyncio.Task):
+        """结束会话（事件循环线程）：已连接则正常关闭 WebSocket，否则取消连接"""
+        ws = self.ws
+        if ws is not None:
+            asyncio.ensure_future(ws.close())
+        else:
+            task.cancel()
+
+    @property
+    def dropped_frames(self) -> int:
+        """本次会话因网络积压被丢弃的音频块数（100ms/块）"""
+        ring = self._ring
+        return ring.dropped // self._chunk_bytes if ring else 0
 
     @property
     def is_running(self):
-        return self._is_running
+        return self._running.is_set()
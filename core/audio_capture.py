@@ -6,35 +6,167 @@
 参考 interview-assistant 项目实现
 """
 
-import struct
+import time
+import atexit
 import threading
 import logging
+import warnings
+from math import gcd
+from functools import partial
 from typing import Callable, Optional, List, Dict
 
 import pyaudiowpatch as pyaudio
 
+from core.ring_buffer import RingBuffer
+from core import audio_simd
+from core.thread_priority import raise_thread_priority
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 缺失时退回纯 Python 实现（memoryview 零拷贝读取）
+    np = None
+
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import audioop
+except ImportError:  # audioop 在 Python 3.13 移除（可安装 audioop-lts）：缺失时退回纯 Python 实现
+    audioop = None
+
+try:
+    from scipy.signal import firwin, resample_poly
+except ImportError:  # SciPy 可选：缺失时退回线性插值
+    firwin = resample_poly = None
+
 logger = logging.getLogger(__name__)
 
 # 音频源类型
 SOURCE_MIC = "mic"
 SOURCE_SPEAKER = "speaker"
 
+# 设备枚举缓存：PortAudio 设备扫描较慢，TTL 内的重复调用直接复用结果
+_DEVICE_CACHE_TTL = 5.0
+_device_cache: Dict[str, tuple] = {}    # key → (时间戳, 结果)
+
+# 进程内共享的 PyAudio 实例：每次创建都要做一次 PortAudio/WASAPI 初始化（数十毫秒）。
+# PortAudio 只在引用计数从 0 变 1 时扫描设备，刷新设备必须先 terminate 旧实例；
+# 有音频流在用时推迟到最后一个流关闭后再释放
+_pa: Optional[pyaudio.PyAudio] = None
+_pa_streams = 0         # 使用共享实例的已打开音频流数
+_pa_stale = False       # 已请求刷新设备，等最后一个流关闭后释放实例
+_pa_lock = threading.RLock()    # 线程池中的设备枚举与 UI 线程都会访问
+
+
+def _get_pa() -> pyaudio.PyAudio:
+    """获取共享的 PyAudio 实例，不存在时创建"""
+    global _pa
+    with _pa_lock:
+        if _pa is None:
+            _pa = pyaudio.PyAudio()
+        return _pa
+
+
+def _acquire_pa() -> pyaudio.PyAudio:
+    """打开音频流前调用：获取共享实例并登记使用者"""
+    global _pa_streams
+    with _pa_lock:
+        _pa_streams += 1
+        return _get_pa()
+
+
+def _release_pa():
+    """音频流关闭后调用：最后一个流关闭且有待处理的刷新请求时释放实例"""
+    global _pa_streams
+    with _pa_lock:
+        _pa_streams -= 1
+        if _pa_streams == 0 and _pa_stale:
+            _reset_pa()
+
+
+def _reset_pa():
+    """释放共享实例并清空设备缓存，下次使用时重新初始化 PortAudio（需持有 _pa_lock）"""
+    global _pa, _pa_stale
+    _device_cache.clear()
+    _pa_stale = False
+    if _pa is not None:
+        try:
+            _pa.terminate()
+        except Exception as e:
+            logger.debug(f"PyAudio terminate failed: {e}")
+        _pa = None
+
+
+@atexit.register
+def _terminate_pa():
+    with _pa_lock:
+        _reset_pa()
+
+
+def _get_cached(key: str):
+    """读取未过期的缓存项，不存在或已过期返回 None"""
+    entry = _device_cache.get(key)
+    if entry and time.monotonic() - entry[0] < _DEVICE_CACHE_TTL:
+        return entry[1]
+    return None
+
+
+def _set_cached(key: str, value):
+    _device_cache[key] = (time.monotonic(), value)
+
 
 class AudioCapture:
     """Windows 音频采集，支持麦克风和 WASAPI Loopback"""
 
+    # 采集环形缓冲区容量（按设备块计），消费线程积压超过该值时覆盖最旧音频
+    RING_BLOCKS = 16
+
     def __init__(self, sample_rate=16000, output_format='pcm', device_index=None):
         self.sample_rate = sample_rate
         self.output_format = output_format.lower()
         self.is_running = False
         self.callback: Optional[Callable[[bytes], None]] = None
-        self._thread: Optional[threading.Thread] = None
-        self.p = pyaudio.PyAudio()
+        self._thread: Optional[threading.Thread] = None     # 消费线程
+        self._stream = None
+        self._ring: Optional[RingBuffer] = None
+        self._data_ready = threading.Event()
+        self._stop_event = threading.Event()                # 通知消费线程退出
+        self._stream_pa: Optional[pyaudio.PyAudio] = None   # 音频流打开期间持有的共享实例
         self.device_info = None
 
         # PCM 模式：每次输出 3200 bytes = 1600 帧 @16kHz ≈ 100ms
         self.pcm_chunk_frames = 1600
 
+        # 线性插值表缓存：设备每次读取的帧数固定，只需按 (源采样率, 长度) 计算一次
+        self._interp_key = None
+        self._interp_table = None
+
+        # 多相 FIR 重采样状态（需要 SciPy，打开音频流时初始化）
+        self._poly_kernel = None
+        self._poly_up = 1
+        self._poly_down = 1
+        self._poly_half = 0
+        self._poly_x = None
+
+        # audioop.ratecv 跨块滤波状态（打开音频流时重置为 None）
+        self._ratecv_state = None
+
+        # 重采样缓冲区：按设备块大小预分配并复用，采集循环中不产生临时数组
+        self._buf_key = None
+        self._mix_i32 = None
+        self._mono_f32 = None
+        self._out_f32 = None
+        self._tmp_f32 = None
+        self._out_i16 = None
+        self._out_bytes = None
+
+        # 当前重采样路径用到的 Numba 内核名，由 _select_resampler 确定，消费线程启动时预热
+        self._simd_kernels = ()
+
+    @property
+    def p(self) -> pyaudio.PyAudio:
+        """当前使用的 PyAudio 实例：采集中为音频流所属实例，否则为共享实例"""
+        return self._stream_pa or _get_pa()
+
     def find_device(self, source_type=SOURCE_MIC, device_index=None) -> Optional[Dict]:
         """
         查找音频设备
@@ -77,18 +209,21 @@ class AudioCapture:
             default_output = self.p.get_device_info_by_index(default_output_index)
             logger.info(f"Default output device: {default_output['name']}")
 
+            loopbacks = self._get_loopbacks()
+            name = default_output['name']
+
             # 精确匹配
-            for loopback in self.p.get_loopback_device_info_generator():
-                if default_output['name'] in loopback['name']:
-                    logger.info(f"Found loopback: {loopback['name']}")
+            for lb_name, loopback in loopbacks.items():
+                if name in lb_name:
+                    logger.info(f"Found loopback: {lb_name}")
                     self.device_info = loopback
                     return loopback
 
             # 模糊匹配
-            for loopback in self.p.get_loopback_device_info_generator():
-                short_name = default_output['name'][:15]
-                if short_name in loopback['name']:
-                    logger.info(f"Found loopback (fuzzy): {loopback['name']}")
+            short_name = name[:15]
+            for lb_name, loopback in loopbacks.items():
+                if short_name in lb_name:
+                    logger.info(f"Found loopback (fuzzy): {lb_name}")
                     self.device_info = loopback
                     return loopback
 
@@ -97,10 +232,40 @@ class AudioCapture:
             logger.error(f"WASAPI Loopback search failed: {e}")
         return None
 
+    def _get_loopbacks(self) -> Dict[str, Dict]:
+        """获取 {名称: 设备信息} 形式的 WASAPI Loopback 设备表（带缓存）"""
+        loopbacks = _get_cached("loopbacks")
+        if loopbacks is None:
+            loopbacks = {lb['name']: lb for lb in self.p.get_loopback_device_info_generator()}
+            _set_cached("loopbacks", loopbacks)
+        return loopbacks
+
+    @staticmethod
+    def refresh_devices():
+        """清空设备枚举缓存并重新初始化 PortAudio，下次查询时重新扫描（设备插拔后调用）"""
+        global _pa_stale
+        with _pa_lock:
+            _device_cache.clear()
+            if _pa_streams:
+                # 正在采集：实例不能释放，等最后一个音频流关闭后再重置
+                _pa_stale = True
+            else:
+                _reset_pa()
+
     @staticmethod
     def list_devices() -> List[Dict]:
-        """列出所有可用音频设备"""
-        p = pyaudio.PyAudio()
+        """列出所有可用音频设备（结果缓存 _DEVICE_CACHE_TTL 秒）"""
+        cached = _get_cached("devices")
+        if cached is not None:
+            return list(cached)
+
+        with _pa_lock:
+            devices = AudioCapture._enumerate(_get_pa())
+        return list(devices)
+
+    @staticmethod
+    def _enumerate(p: pyaudio.PyAudio) -> List[Dict]:
+        """扫描设备并写入缓存（调用方持有 _pa_lock，期间实例不会被释放）"""
         devices = []
 
         # 普通输入设备（麦克风）
@@ -130,7 +295,9 @@ class AudioCapture:
         except Exception as e:
             logger.warning(f"Cannot enumerate loopback devices: {e}")
 
-        p.terminate()
+        # 推迟中的刷新请求意味着这份结果来自旧的设备快照，不缓存
+        if not _pa_stale:
+            _set_cached("devices", devices)
         return devices
 
     def start(self, source_type=SOURCE_MIC, device_index=None, callback=None):
@@ -139,7 +306,8 @@ class AudioCapture:
         Args:
             source_type: "mic" or "speaker"
             device_index: 指定设备索引（None=自动）
-            callback: 回调函数 callback(pcm_bytes)
+            callback: 回调函数 callback(pcm)，pcm 可能是指向内部缓冲区的 memoryview，
+                      仅在回调期间有效，需要保留时由调用方拷贝
         """
         if self.is_running:
             logger.warning("Audio capture already running")
@@ -152,97 +320,333 @@ class AudioCapture:
         if not device:
             raise RuntimeError(f"No audio device found for source_type={source_type}")
 
-        self.is_running = True
-        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
-        self._thread.start()
+        self._open_stream()
 
-    def _capture_loop(self):
-        """音频采集循环"""
+    def _open_stream(self):
+        """
+        以回调模式打开音频流：PortAudio 线程只把 PCM 写入环形缓冲区，
+        消费线程取出整块后重采样并交给 callback，采集不受下游处理耗时影响
+        """
         device_rate = int(self.device_info['defaultSampleRate'])
         device_channels = max(1, int(self.device_info['maxInputChannels']))
+
+        # 驱动能直接提供目标格式时，让 PortAudio/WASAPI 完成转换，跳过 Python 重采样
+        if (device_rate, device_channels) != (self.sample_rate, 1) and self._supports_target_format():
+            logger.info(f"Device supports {self.sample_rate}Hz/1ch natively, skipping resampler")
+            device_rate, device_channels = self.sample_rate, 1
+
         need_resample = (device_rate != self.sample_rate) or (device_channels != 1)
 
         if need_resample:
             logger.info(f"Resampling: {device_rate}Hz/{device_channels}ch → {self.sample_rate}Hz/1ch")
 
-        # 计算设备端每次读取的帧数
+        self._poly_kernel = None
+        self._ratecv_state = None
+        if device_rate != self.sample_rate and resample_poly is not None:
+            self._init_polyphase(device_rate)
+
+        # 计算设备端每块的帧数
         device_frames = int(self.pcm_chunk_frames * device_rate / self.sample_rate)
+        resample = self._select_resampler(device_frames, device_rate, device_channels)
+
+        block_bytes = device_frames * device_channels * 2
+        self._ring = RingBuffer(block_bytes * self.RING_BLOCKS)
+        self._data_ready.clear()
+        self._stop_event.clear()
+        self.is_running = True
 
-        stream = None
+        self._stream_pa = _acquire_pa()
         try:
-            stream = self.p.open(
+            # 麦克风与 WASAPI Loopback 都直接请求 int16 采样：共享模式下的 float32 混音格式
+            # 由 PortAudio 在 C 层转换，Python 侧不做任何 float → int16 转换
+            self._stream = self.p.open(
                 format=pyaudio.paInt16,
                 channels=device_channels,
                 rate=device_rate,
                 input=True,
                 input_device_index=self.device_info['index'],
                 frames_per_buffer=device_frames,
+                stream_callback=self._pa_callback,
             )
-            logger.info(f"Audio stream opened: {self.device_info['name']}")
+        except Exception as e:
+            self.is_running = False
+            self._stream_pa = None
+            _release_pa()
+            logger.error(f"Audio stream init error: {e}")
+            raise
 
-            while self.is_running:
-                try:
-                    raw_data = stream.read(device_frames, exception_on_overflow=False)
+        self._thread = threading.Thread(target=self._consume_loop, args=(resample, block_bytes), daemon=True)
+        self._thread.start()
+        logger.info(f"Audio stream opened: {self.device_info['name']}")
 
-                    if need_resample:
-                        pcm_data = self._resample(raw_data, device_rate, device_channels)
-                    else:
-                        pcm_data = raw_data
+    def _pa_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio 回调（音频线程）：只写入环形缓冲区并唤醒消费线程"""
+        self._ring.write(in_data)
+        self._data_ready.set()
+        return None, pyaudio.paContinue
 
+    def _consume_loop(self, resample: Callable, block_bytes: int):
+        """
+        消费线程：每次唤醒一次性取出环形缓冲区中所有完整的设备块，
+        再逐块重采样后交给 callback（积压多块时只需一次读取）
+        """
+        raise_thread_priority("audio-consumer")
+        # 在消费线程中预热（每进程一次），不阻塞 UI 线程；编译期间的音频暂存在环形缓冲区中
+        audio_simd.warmup(*self._simd_kernels)
+        ring, data_ready, stop_event = self._ring, self._data_ready, self._stop_event
+        batch = memoryview(bytearray(block_bytes * self.RING_BLOCKS))
+        while not stop_event.is_set():
+            data_ready.wait(timeout=0.5)
+            data_ready.clear()
+            blocks = ring.available // block_bytes
+            if not blocks:
+                continue
+            n = ring.read_into(batch[:blocks * block_bytes])
+            for offset in range(0, n - block_bytes + 1, block_bytes):
+                if stop_event.is_set():
+                    break
+                try:
+                    pcm_data = resample(batch[offset:offset + block_bytes])
                     if self.callback and pcm_data:
                         self.callback(pcm_data)
                 except Exception as e:
-                    if self.is_running:
-                        logger.error(f"Audio read error: {e}")
-                    break
-        except Exception as e:
-            logger.error(f"Audio stream init error: {e}")
-        finally:
-            if stream:
-                try:
-                    stream.stop_stream()
-                    stream.close()
-                except Exception:
-                    pass
-            logger.info("Audio stream closed")
+                    logger.error(f"Audio processing error: {e}")
+        if ring.dropped:
+            logger.warning(f"Audio consumer fell behind, {ring.dropped} bytes dropped")
 
-    def _resample(self, raw_data: bytes, source_rate: int, source_channels: int) -> bytes:
-        """重采样：任意采样率/声道 → 16kHz/单声道"""
-        samples = struct.unpack(f'<{len(raw_data) // 2}h', raw_data)
+    def _select_resampler(self, frames: int, source_rate: int, source_channels: int) -> Callable:
+        """
+        按打开音频流时确定的 (采样率, 声道, 块大小) 选出专用重采样函数，
+        采集循环中不再重复判断格式与分支
+        """
+        self._simd_kernels = ()
+        if source_rate == self.sample_rate and source_channels == 1:
+            return lambda raw_data: raw_data
+
+        if np is None:
+            if audioop is not None and source_channels <= 2:
+                return partial(self._resample_audioop, source_rate=source_rate, source_channels=source_channels)
+            return partial(self._resample_pure, source_rate=source_rate, source_channels=source_channels)
+
+        self._alloc_buffers(frames, source_channels, source_rate)
+        if self._poly_kernel is None:
+            # 整数倍降采样的单声道输入：线性插值的 frac 恒为 0，等价于按步长抽取
+            if source_channels == 1 and source_rate % self.sample_rate == 0:
+                return partial(self._resample_decimate, step=source_rate // self.sample_rate)
+            if audio_simd.resample_int16 is None:
+                self._get_interp_table(source_rate, frames)    # 预先计算插值表
+        # 与 _resample 的分支一致：无多相滤波时整块交给 resample_int16，否则只用 f32_to_i16
+        self._simd_kernels = ("resample_int16",) if self._poly_kernel is None else ("f32_to_i16",)
+        return partial(self._resample, source_rate=source_rate, source_channels=source_channels)
+
+    def _resample_decimate(self, raw_data: bytes, step: int) -> memoryview:
+        """整数倍抽取（单声道），结果写入预分配的 int16 缓冲区"""
+        samples = np.frombuffer(raw_data, dtype='<i2')
+        n = len(samples) // step
+        self._out_i16[:n] = samples[:n * step:step]
+        return self._out_bytes[:n * 2]
+
+    def _supports_target_format(self) -> bool:
+        """设备是否支持直接以目标采样率、单声道、16bit 采集"""
+        try:
+            return self.p.is_format_supported(
+                rate=self.sample_rate,
+                input_device=self.device_info['index'],
+                input_channels=1,
+                input_format=pyaudio.paInt16,
+            )
+        except ValueError:
+            return False
+
+    def _alloc_buffers(self, frames: int, channels: int, source_rate: int):
+        """按设备块大小预分配重采样缓冲区（打开音频流时调用一次）"""
+        out_frames = frames * self.sample_rate // source_rate
+        self._buf_key = (frames, channels, source_rate)
+        self._mix_i32 = np.empty(frames, dtype=np.int32)
+        self._mono_f32 = np.empty(frames, dtype=np.float32)
+        self._out_f32 = np.empty(out_frames, dtype=np.float32)
+        self._tmp_f32 = np.empty(out_frames, dtype=np.float32)
+        self._out_i16 = np.empty(out_frames, dtype=np.int16)
+        self._out_bytes = memoryview(self._out_i16).cast('B')
+        if self._poly_kernel is not None:
+            self._poly_x = np.zeros(2 * self._poly_half + frames, dtype=np.float32)
+
+    def _resample(self, raw_data: bytes, source_rate: int, source_channels: int) -> memoryview:
+        """
+        重采样：任意采样率/声道 → 16kHz/单声道
+        返回指向内部输出缓冲区的 memoryview，仅在下一次调用前有效
+        """
+        if np is None:
+            if audioop is not None and source_channels <= 2:
+                return self._resample_audioop(raw_data, source_rate, source_channels)
+            return self._resample_pure(raw_data, source_rate, source_channels)
+
+        samples = np.frombuffer(raw_data, dtype='<i2')
+        frames = len(samples) // source_channels
+        if self._buf_key != (frames, source_channels, source_rate):
+            self._alloc_buffers(frames, source_channels, source_rate)
+
+        if self._poly_kernel is None and audio_simd.resample_int16 is not None:
+            n = audio_simd.resample_int16(samples, source_rate, source_channels, self.sample_rate, self._out_i16)
+            return self._out_bytes[:n * 2]
+
+        # 多声道 → 单声道（取平均，int32 求和防止溢出）
+        # 多相重采样时直接写入滤波上下文缓冲区的尾部，省去一次整块拷贝
+        polyphase = self._poly_kernel is not None and source_rate != self.sample_rate
+        mono = self._poly_x[2 * self._poly_half:] if polyphase else self._mono_f32
+        if source_channels > 1:
+            np.sum(samples.reshape(-1, source_channels), axis=1, dtype=np.int32, out=self._mix_i32)
+            np.multiply(self._mix_i32, 1.0 / source_channels, out=mono)
+        else:
+            mono[:] = samples
 
-        # 多声道 → 单声道（取平均）
+        if source_rate == self.sample_rate:
+            result = mono
+        elif polyphase:
+            # 多相 FIR 重采样（带抗混叠滤波）
+            result = self._resample_polyphase(frames)
+        else:
+            # 线性插值
+            result = self._resample_linear(mono, source_rate)
+
+        if audio_simd.f32_to_i16 is not None:
+            n = audio_simd.f32_to_i16(result, self._out_i16, 1.0)
+        else:
+            np.clip(result, -32768, 32767, out=result)
+            n = len(result)
+            self._out_i16[:n] = result
+        return self._out_bytes[:n * 2]
+
+    def _resample_audioop(self, raw_data: bytes, source_rate: int, source_channels: int) -> bytes:
+        """audioop 重采样（无 NumPy 时优先使用）：降混与变采样均在 C 中完成，ratecv 跨块保留状态"""
+        mono = audioop.tomono(raw_data, 2, 0.5, 0.5) if source_channels == 2 else raw_data
+        if source_rate == self.sample_rate:
+            return mono
+        out, self._ratecv_state = audioop.ratecv(
+            mono, 2, 1, source_rate, self.sample_rate, self._ratecv_state
+        )
+        return out
+
+    def _pure_out(self, n: int) -> memoryview:
+        """纯 Python 路径的输出缓冲区（int16 视图），长度不变时复用，不每块分配"""
+        if self._out_bytes is None or len(self._out_bytes) != n * 2:
+            self._out_bytes = memoryview(bytearray(n * 2))
+        return self._out_bytes.cast('h')
+
+    def _resample_pure(self, raw_data: bytes, source_rate: int, source_channels: int) -> memoryview:
+        """
+        纯 Python 重采样（无 NumPy 时的回退），通过 memoryview.cast 直接读写 int16
+        返回指向内部输出缓冲区的 memoryview，仅在下一次调用前有效
+        """
+        samples = memoryview(raw_data).cast('h')
+
+        # 多声道 → 单声道（取平均）：按声道步进切片，无需解包成元组
         if source_channels > 1:
-            mono = []
-            for i in range(0, len(samples), source_channels):
-                chunk = samples[i:i + source_channels]
-                mono.append(sum(chunk) // len(chunk))
-            samples = mono
+            channels = [samples[c::source_channels] for c in range(source_channels)]
+            samples = [total // source_channels for total in map(sum, zip(*channels))]
+
+        n = len(samples)
+        if source_rate == self.sample_rate:
+            outv = self._pure_out(n)
+            for i in range(n):
+                outv[i] = samples[i]
+            return self._out_bytes
 
         # 重采样（线性插值）
-        if source_rate != self.sample_rate:
+        ratio = self.sample_rate / source_rate
+        new_length = n * self.sample_rate // source_rate
+        outv = self._pure_out(new_length)
+        for i in range(new_length):
+            src_pos = i / ratio
+            idx = int(src_pos)
+            frac = src_pos - idx
+            if idx + 1 < n:
+                value = int(samples[idx] * (1 - frac) + samples[idx + 1] * frac)
+            else:
+                value = samples[idx]
+            outv[i] = max(-32768, min(32767, value))
+        return self._out_bytes
+
+    def _resample_linear(self, mono: "np.ndarray", source_rate: int) -> "np.ndarray":
+        """线性插值重采样，结果写入预分配的 float32 缓冲区"""
+        idx, idx_next, frac, frac_inv = self._get_interp_table(source_rate, len(mono))
+        a, b = self._out_f32, self._tmp_f32
+        np.take(mono, idx, out=a)
+        np.multiply(a, frac_inv, out=a)
+        np.take(mono, idx_next, out=b)
+        np.multiply(b, frac, out=b)
+        np.add(a, b, out=a)
+        return a
+
+    def _init_polyphase(self, source_rate: int):
+        """按 (源采样率, 目标采样率) 预计算多相 FIR 滤波器，避免每块重新设计"""
+        g = gcd(source_rate, self.sample_rate)
+        up, down = self.sample_rate // g, source_rate // g
+
+        # 与 resample_poly 默认设计一致：截止频率 1/max(up, down)，Kaiser 窗
+        max_rate = max(up, down)
+        half_len = 10 * max_rate
+        # 转为 float32：与 float32 的 _poly_x 一起使 resample_poly 输出 float32，
+        # 后续 f32_to_i16 只需 float32 这一种特化（float64 系数会让输出提升为 float64）
+        self._poly_kernel = firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', 8.0)).astype(np.float32)
+
+        # 滤波器在输入域的半长，取 down 的整数倍，保证输出对齐到整数样本
+        half_in = -(-half_len // up)
+        half_in = -(-half_in // down) * down
+
+        self._poly_up, self._poly_down, self._poly_half = up, down, half_in
+        self._poly_x = None
+
+    def _resample_polyphase(self, frames: int) -> "np.ndarray":
+        """
+        多相 FIR 重采样，本块的 frames 个单声道样本已写入 self._poly_x 尾部
+        跨块保留 2*half 个输入样本作为上下文，输出延迟 half 个输入样本，
+        使块边界处的滤波结果与整段连续处理一致；结果写入预分配的 float32 缓冲区
+        """
+        up, down, half = self._poly_up, self._poly_down, self._poly_half
+        x = self._poly_x
+
+        y = resample_poly(x, up, down, window=self._poly_kernel)
+        x[:2 * half] = x[-2 * half:]
+        start = half * up // down
+        n = frames * up // down
+        out = self._out_f32[:n]
+        np.copyto(out, y[start:start + n])
+        return out
+
+    def _get_interp_table(self, source_rate: int, length: int):
+        """获取线性插值表 (idx, idx+1, frac, 1-frac)，按 (源采样率, 长度) 缓存"""
+        key = (source_rate, length)
+        if self._interp_key != key:
             ratio = self.sample_rate / source_rate
-            new_length = int(len(samples) * ratio)
-            resampled = []
-            for i in range(new_length):
-                src_pos = i / ratio
-                idx = int(src_pos)
-                frac = src_pos - idx
-                if idx + 1 < len(samples):
-                    value = int(samples[idx] * (1 - frac) + samples[idx + 1] * frac)
-                elif idx < len(samples):
-                    value = samples[idx]
-                else:
-                    break
-                resampled.append(max(-32768, min(32767, value)))
-            samples = resampled
-
-        return struct.pack(f'<{len(samples)}h', *samples)
+            new_length = length * self.sample_rate // source_rate
+            src_pos = np.arange(new_length, dtype=np.float32) / ratio
+            idx = src_pos.astype(np.int32)
+            frac = src_pos - idx
+            idx_next = np.minimum(idx + 1, length - 1)
+            self._interp_table = (idx, idx_next, frac, 1 - frac)
+            self._interp_key = key
+        return self._interp_table
 
     def stop(self):
         """停止采集"""
         if not self.is_running:
             return
         self.is_running = False
+        # 先通知消费线程停止分发，再关闭音频流，最后唤醒它退出
+        self._stop_event.set()
+        if self._stream:
+            try:
+                self._stream.stop_stream()
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+            logger.info("Audio stream closed")
+        if self._stream_pa is not None:
+            self._stream_pa = None
+            _release_pa()
+        self._data_ready.set()
         if self._thread:
             self._thread.join(timeout=3)
             self._thread = None
@@ -255,8 +659,3 @@ class AudioCapture:
 
     def __del__(self):
         self.stop()
-        if self.p:
-            try:
-                self.p.terminate()
-            except Exception:
-                pass
@@ -0,0 +1,84 @@
+"""
+Numba 编译的 PCM 处理内核
+内核写成逐样本的简单循环，由 LLVM 自动向量化（x86 AVX/SSE、ARM NEON）；
+Numba 缺失时各内核为 None，调用方退回 NumPy 实现
+"""
+
+import threading
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # Numba 可选：缺失时使用 NumPy 向量化实现
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def resample_int16(raw_i16, src_rate, channels, dst_rate, out):
+        """降混 + 线性插值重采样，结果写入 int16 数组 out，返回样本数"""
+        n = raw_i16.shape[0] // channels
+        ratio = dst_rate / src_rate
+        new_length = min(int(n * ratio), out.shape[0])
+        for i in range(new_length):
+            src_pos = i / ratio
+            idx = int(src_pos)
+            frac = src_pos - idx
+            nxt = idx + 1 if idx + 1 < n else idx
+
+            # 多声道 → 单声道（取平均）与线性插值合并在一次遍历中
+            a = 0
+            b = 0
+            for c in range(channels):
+                a += raw_i16[idx * channels + c]
+                b += raw_i16[nxt * channels + c]
+            value = (a * (1.0 - frac) + b * frac) / channels
+
+            if value > 32767.0:
+                value = 32767.0
+            elif value < -32768.0:
+                value = -32768.0
+            out[i] = np.int16(value)
+        return new_length
+
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def f32_to_i16(src, dst, scale):
+        """float32 → int16：缩放、限幅与类型转换合并为一次遍历，返回样本数"""
+        n = min(src.shape[0], dst.shape[0])
+        for i in range(n):
+            value = src[i] * scale
+            if value > 32767.0:
+                value = 32767.0
+            elif value < -32768.0:
+                value = -32768.0
+            dst[i] = np.int16(value)
+        return n
+else:
+    resample_int16 = f32_to_i16 = None
+
+
+# 已预热的内核名：JIT 编译每个进程只需触发一次
+_warmed = set()
+_warm_lock = threading.Lock()
+
+
+def warmup(*kernels: str):
+    """
+    用小数组调用一次指定内核（"resample_int16" / "f32_to_i16"）触发 JIT 编译，
+    避免首个音频块卡顿；每个内核每进程只预热一次，Numba 缺失时什么也不做
+    """
+    if njit is None:
+        return
+    with _warm_lock:
+        for name in kernels:
+            if name in _warmed:
+                continue
+            # 参数类型须与 AudioCapture._resample 的实际调用一致（可写的 C 连续数组、
+            # float32 输入），否则首个音频块仍会触发另一份特化的编译
+            if name == "resample_int16":
+                resample_int16(np.zeros(32, dtype=np.int16), 2, 2, 1, np.empty(16, dtype=np.int16))
+            elif name == "f32_to_i16":
+                f32_to_i16(np.zeros(16, dtype=np.float32), np.empty(16, dtype=np.int16), 1.0)
+            else:
+                raise ValueError(f"Unknown kernel: {name}")
+            _warmed.add(name)
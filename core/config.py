@@ -0,0 +1,31 @@
+"""
+YAML 配置文件读取
+按 (路径, mtime_ns, size) 缓存解析结果，文件未修改时重复读取只需一次深拷贝
+"""
+
+import os
+import copy
+import functools
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML 未编译 libyaml 时使用纯 Python 解析器
+    from yaml import SafeLoader as _YamlLoader
+
+
+@functools.lru_cache(maxsize=4)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int) -> dict:
+    """解析 YAML 文件；mtime_ns/size 只参与缓存键，文件一改键就失效"""
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
+def load_yaml(path: str) -> dict:
+    """读取 YAML 文件为 dict，文件不存在时返回空 dict；返回值可随意修改"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    return copy.deepcopy(_load_yaml_cached(path, st.st_mtime_ns, st.st_size))
@@ -3,6 +3,7 @@
 """
 
 import logging
+import threading
 from typing import Callable, Optional
 from dataclasses import dataclass
 
@@ -24,11 +25,20 @@ class ChannelConfig:
 class Interpreter:
     """同声传译调度器"""
 
+    # 语言切换防抖（秒）：连续切换只在最后一次之后应用一次，避免反复重建会话
+    SWITCH_DEBOUNCE = 0.2
+
     def __init__(self, config: dict):
         self.config = config
         self.channels = {}
         self._on_result_callback = None
         self._is_running = False
+        self._switch_lock = threading.Lock()
+        self._pending_lang = {}         # 通道名 → 待切换的目标语言
+        self._switch_timer: Optional[threading.Timer] = None
+        # 每次 stop() 加一：正在执行的切换发现代数变化即放弃，不会在停止后重建会话
+        self._switch_generation = 0
+        self._apply_lock = threading.Lock()     # 切换执行期间持有，stop() 借此等待其结束
 
     def set_result_callback(self, callback: Callable[[str, TranslationResult], None]):
         self._on_result_callback = callback
@@ -37,7 +47,7 @@ class Interpreter:
         audio = AudioCapture(
             sample_rate=self.config.get("audio", {}).get("sample_rate", 16000),
         )
-        translator = ASRTranslator(self.config)
+        translator = ASRTranslator(self.config, channel_name=channel_config.name)
         self.channels[channel_config.name] = {
             "audio": audio,
             "translator": translator,
@@ -45,22 +55,23 @@ class Interpreter:
         }
         logger.info(f"Channel added: {channel_config.name} ({channel_config.source_type}) → {channel_config.target_lang}")
 
+    def remove_all_channels(self):
+        """移除所有通道（运行中则先停止），调度器本身可继续复用"""
+        if self._is_running:
+            self.stop()
+        self._cancel_pending_switch()
+        self.channels.clear()
+
     def start(self):
         if self._is_running:
             return
 
-        for name, ch in self.channels.items():
+        # 翻译器直接以 (通道名, 结果) 调用外部回调，结果路径上没有中转函数
+        for ch in self.channels.values():
             config = ch["config"]
-
-            def make_callback(ch_name):
-                def on_result(result: TranslationResult):
-                    if self._on_result_callback:
-                        self._on_result_callback(ch_name, result)
-                return on_result
-
             ch["translator"].start(
                 target_lang=config.target_lang,
-                on_result=make_callback(name)
+                on_result=self._on_result_callback
             )
 
             ch["audio"].start(
@@ -73,6 +84,12 @@ class Interpreter:
         logger.info("Interpreter started")
 
     def stop(self):
+        with self._switch_lock:
+            self._switch_generation += 1
+        self._cancel_pending_switch()
+        # 等待正在执行的语言切换结束（它看到代数变化后不会再处理后续通道）
+        with self._apply_lock:
+            pass
         for name, ch in self.channels.items():
             ch["audio"].stop()
             ch["translator"].stop()
@@ -80,10 +97,43 @@ class Interpreter:
         logger.info("Interpreter stopped")
 
     def switch_language(self, channel_name: str, target_lang: str):
-        if channel_name in self.channels:
-            ch = self.channels[channel_name]
-            ch["translator"].switch_language(target_lang)
-            ch["config"].target_lang = target_lang
+        """切换目标语言（防抖：SWITCH_DEBOUNCE 内的多次切换合并为一次）"""
+        if channel_name not in self.channels:
+            return
+        self.channels[channel_name]["config"].target_lang = target_lang
+        with self._switch_lock:
+            self._pending_lang[channel_name] = target_lang
+            if self._switch_timer:
+                self._switch_timer.cancel()
+            self._switch_timer = threading.Timer(self.SWITCH_DEBOUNCE, self._apply_pending_switch)
+            self._switch_timer.daemon = True
+            self._switch_timer.start()
+
+    def _apply_pending_switch(self):
+        """防抖定时器到期：对每个通道应用最后一次请求的目标语言"""
+        with self._apply_lock:
+            with self._switch_lock:
+                pending, self._pending_lang = self._pending_lang, {}
+                self._switch_timer = None
+                generation = self._switch_generation
+            for channel_name, target_lang in pending.items():
+                if self._switch_generation != generation or not self._is_running:
+                    return      # 期间调用了 stop()
+                ch = self.channels.get(channel_name)
+                if ch:
+                    ch["translator"].switch_language(target_lang)
+
+    def _cancel_pending_switch(self):
+        with self._switch_lock:
+            if self._switch_timer:
+                self._switch_timer.cancel()
+                self._switch_timer = None
+            self._pending_lang.clear()
+
+    @property
+    def dropped_frames(self) -> int:
+        """所有通道因网络积压丢弃的音频块总数"""
+        return sum(ch["translator"].dropped_frames for ch in self.channels.values())
 
     @staticmethod
     def list_devices():
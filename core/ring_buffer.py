@@ -0,0 +1,63 @@
+"""
+单生产者/单消费者 (SPSC) 字节环形缓冲区
+用于实时音频链路：生产者写入不加锁、不分配内存，空间不足时覆盖最旧数据
+"""
+
+
+class RingBuffer:
+    """
+    SPSC 字节环形缓冲区
+    head/tail 是单调递增的累计字节数，分别只由生产者/消费者修改；
+    CPython 下整数读写与 memoryview 切片拷贝都在 GIL 内完成，热路径无需加锁
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._head = 0      # 已写入字节总数（仅生产者修改）
+        self._tail = 0      # 已读出字节总数（仅消费者修改）
+        self.dropped = 0    # 未读即被覆盖的字节数（消费者统计）
+
+    @property
+    def available(self) -> int:
+        """当前可读字节数"""
+        return min(self._head - self._tail, self.capacity)
+
+    def write(self, data) -> None:
+        """写入数据（生产者），空间不足时覆盖最旧数据"""
+        src = memoryview(data).cast('B')
+        n = len(src)
+        cap = self.capacity
+        if n > cap:
+            src = src[n - cap:]
+            self._head += n - cap
+            n = cap
+
+        pos = self._head % cap
+        first = min(n, cap - pos)
+        self._view[pos:pos + first] = src[:first]
+        if first < n:
+            self._view[:n - first] = src[first:]
+        self._head += n
+
+    def read_into(self, out) -> int:
+        """读取最多 len(out) 字节到 out（消费者），返回实际读取的字节数"""
+        dst = memoryview(out).cast('B')
+        cap = self.capacity
+        while True:
+            head = self._head
+            tail = max(self._tail, head - cap)  # 跳过已被覆盖的数据
+            n = min(head - tail, len(dst))
+            pos = tail % cap
+            first = min(n, cap - pos)
+            dst[:first] = self._view[pos:pos + first]
+            if first < n:
+                dst[first:n] = self._view[:n - first]
+            # 拷贝期间生产者又覆盖了这段数据则重读
+            if self._head - cap <= tail:
+                break
+
+        self.dropped += tail - self._tail
+        self._tail = tail + n
+        return n
@@ -0,0 +1,45 @@
+"""
+线程优先级工具
+把音频消费线程、网络发送线程提升到高于普通线程的优先级，
+减少系统负载高时的卡顿与丢帧；平台不支持或权限不足时保持原优先级
+"""
+
+import os
+import sys
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Windows SetThreadPriority 优先级常量
+THREAD_PRIORITY_TIME_CRITICAL = 15
+
+# Linux 实时优先级（1-99）：只需略高于普通线程，取低值避免循环空转时饿死系统其他任务
+SCHED_RR_PRIORITY = 2
+
+
+def raise_thread_priority(name: str = "") -> bool:
+    """提升当前线程的调度优先级（需在目标线程内调用），成功返回 True"""
+    label = name or threading.current_thread().name
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            if not kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_TIME_CRITICAL):
+                raise ctypes.WinError()
+        elif hasattr(os, "sched_setscheduler"):
+            # Linux：低优先级 SCHED_RR（需要 CAP_SYS_NICE / RLIMIT_RTPRIO），
+            # 无权限时保持原优先级（负 nice 值同样需要该权限，不再尝试）
+            try:
+                os.sched_setscheduler(0, os.SCHED_RR, os.sched_param(SCHED_RR_PRIORITY))
+            except PermissionError as e:
+                logger.debug(f"Keeping default priority for thread {label}: {e}")
+                return False
+        else:
+            return False
+    except Exception as e:
+        logger.warning(f"Cannot raise priority of thread {label}: {e}")
+        return False
+
+    logger.info(f"Raised priority of thread {label}")
+    return True
@@ -6,34 +6,48 @@ Live Interpreter - 同声传译
 import sys
 import os
 import yaml
+import queue
+import atexit
+import threading
 import logging
-
-# 日志配置
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("live-interpreter.log", encoding="utf-8")
-    ]
-)
+from logging.handlers import QueueHandler, QueueListener
+
+from core.config import load_yaml
+
+# 日志配置：各线程只把日志记录放入队列，由后台监听线程统一写控制台和文件，
+# 音频/网络线程不会阻塞在磁盘 I/O 上
+_log_formatter = logging.Formatter("%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+_log_handlers = [
+    logging.StreamHandler(),
+    logging.FileHandler("live-interpreter.log", encoding="utf-8"),
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))   # 最终格式由监听线程的 handler 决定
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 logger = logging.getLogger(__name__)
 
 
+CONFIG_PATH = "config.yaml"
+USER_SETTINGS_PATH = "user_settings.yaml"
+
+
 def load_config():
     """加载配置：config.yaml (默认) + user_settings.yaml (用户覆盖)"""
-    config = {}
+    logger.debug(f"Parsing config (libyaml={yaml.__with_libyaml__})")
 
-    # 1. 加载默认配置
-    if os.path.exists("config.yaml"):
-        with open("config.yaml", "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f) or {}
+    # 1. 加载默认配置（load_yaml 按 mtime/size 在进程内缓存解析结果）
+    config = load_yaml(CONFIG_PATH)
 
     # 2. 加载用户设置（覆盖默认）
-    if os.path.exists("user_settings.yaml"):
-        with open("user_settings.yaml", "r", encoding="utf-8") as f:
-            user = yaml.safe_load(f) or {}
-        _deep_merge(config, user)
+    _deep_merge(config, load_yaml(USER_SETTINGS_PATH))
 
     # 3. 环境变量兜底
     if not config.get("dashscope", {}).get("api_key") and os.environ.get("DASHSCOPE_API_KEY"):
@@ -43,20 +57,37 @@ def load_config():
 
 
 def _deep_merge(base: dict, override: dict):
-    """深度合并配置"""
-    for k, v in override.items():
-        if k in base and isinstance(base[k], dict) and isinstance(v, dict):
-            _deep_merge(base[k], v)
-        else:
-            base[k] = v
+    """深度合并配置（显式栈迭代，无递归）"""
+    stack = [(base, override)]
+    while stack:
+        dst, src = stack.pop()
+        for k, v in src.items():
+            cur = dst.get(k)
+            if isinstance(cur, dict) and isinstance(v, dict):
+                stack.append((cur, v))
+            else:
+                dst[k] = v
+
+
+def _preload_ui():
+    """后台导入 Qt 与 UI 模块（含 NumPy/SciPy 等依赖），与读取配置并行"""
+    try:
+        import PyQt6.QtWidgets  # noqa: F401
+        import ui.main_window  # noqa: F401
+    except Exception as e:
+        logger.debug(f"UI preload failed: {e}")  # 主线程导入时会再次报错
 
 
 def main():
-    from PyQt6.QtWidgets import QApplication
-    from ui.main_window import MainWindow
+    preload = threading.Thread(target=_preload_ui, daemon=True)
+    preload.start()
 
     config = load_config()
 
+    preload.join()
+    from PyQt6.QtWidgets import QApplication
+    from ui.main_window import MainWindow
+
     app = QApplication(sys.argv)
     app.setApplicationName("Live Interpreter")
 
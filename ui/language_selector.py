@@ -3,7 +3,7 @@
 """
 
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QComboBox, QLabel, QPushButton
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import pyqtSignal, QSignalBlocker
 
 
 class LanguageSelector(QWidget):
@@ -24,6 +24,10 @@ class LanguageSelector(QWidget):
 
     TARGET_LANGUAGES = [lang for lang in LANGUAGES if lang[0] != "auto"]
 
+    # 语言代码 → 下拉框索引（与上面两个列表的填充顺序一致）
+    _SOURCE_INDEX = {code: i for i, (code, _) in enumerate(LANGUAGES)}
+    _TARGET_INDEX = {code: i for i, (code, _) in enumerate(TARGET_LANGUAGES)}
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._init_ui()
@@ -69,17 +73,16 @@ class LanguageSelector(QWidget):
         if source == "auto":
             return  # 自动检测不能交换
 
-        # 在 source combo 中找 target
-        for i in range(self.source_combo.count()):
-            if self.source_combo.itemData(i) == target:
-                self.source_combo.setCurrentIndex(i)
-                break
-
-        # 在 target combo 中找 source
-        for i in range(self.target_combo.count()):
-            if self.target_combo.itemData(i) == source:
-                self.target_combo.setCurrentIndex(i)
-                break
+        si = self._SOURCE_INDEX.get(target)
+        ti = self._TARGET_INDEX.get(source)
+
+        # 两个下拉框一起改完后只发一次 language_changed，避免下游切换两次会话
+        with QSignalBlocker(self.source_combo), QSignalBlocker(self.target_combo):
+            if si is not None:
+                self.source_combo.setCurrentIndex(si)
+            if ti is not None:
+                self.target_combo.setCurrentIndex(ti)
+        self._on_change()
 
     def _on_change(self):
         source = self.source_combo.currentData()
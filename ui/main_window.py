@@ -4,12 +4,14 @@
 
 import os
 import logging
+from functools import partial
+from typing import Optional
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QTextEdit, QLabel, QPushButton, QComboBox,
+    QPlainTextEdit, QLabel, QPushButton, QComboBox,
     QSplitter, QGroupBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot
+from PyQt6.QtCore import Qt, QTimer, QThreadPool, QSignalBlocker, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QFont, QTextCursor
 
 from ui.language_selector import LanguageSelector
@@ -20,16 +22,59 @@ from core.audio_capture import AudioCapture, SOURCE_MIC, SOURCE_SPEAKER
 
 logger = logging.getLogger(__name__)
 
+# 按钮样式表：模块加载时构造一次，各实例共用同一字符串
+_SETTINGS_QSS = (
+    "QPushButton { background-color: #9E9E9E; color: white; font-size: 13px; border-radius: 6px; padding: 0 14px; }"
+    "QPushButton:hover { background-color: #757575; }"
+)
+_START_QSS = (
+    "QPushButton { background-color: #4CAF50; color: white; font-size: 16px; border-radius: 8px; padding: 0 20px; }"
+    "QPushButton:hover { background-color: #45a049; }"
+)
+_STOP_QSS = (
+    "QPushButton { background-color: #f44336; color: white; font-size: 16px; border-radius: 8px; padding: 0 20px; }"
+    "QPushButton:hover { background-color: #da190b; }"
+)
+_CLEAR_QSS = (
+    "QPushButton { background-color: #607D8B; color: white; font-size: 16px; border-radius: 8px; padding: 0 20px; }"
+)
+
 
 class MainWindow(QMainWindow):
     result_signal = pyqtSignal(str, object)
+    devices_loaded = pyqtSignal(object, bool)   # (设备列表, 是否在状态栏提示)
+
+    # 中间结果刷新间隔（毫秒）：期间的多次中间结果只显示最新一条（约 16Hz）；
+    # 最终结果不受限，到达即刷新
+    PARTIAL_FLUSH_INTERVAL_MS = 60
 
     def __init__(self, config: dict):
         super().__init__()
         self.config = config
-        self.interpreter = None
+        # 调度器在窗口生命周期内复用，每次开始只重建通道
+        self.interpreter = Interpreter(config)
+        self.interpreter.set_result_callback(self.result_signal.emit)
         self._is_interpreting = False
         self._devices = []
+        # 按音频源预先分好的设备下拉项 [(显示名, 设备索引)]
+        self._mic_devices = []
+        self._loopback_devices = []
+        self._last_dropped = 0
+        self._settings_dialog: Optional[SettingsDialog] = None     # 首次打开时创建，之后复用
+        # 当前正在流式更新的中间结果（None 表示没有），其所在行总是面板的最后一行
+        self._partial_src: Optional[str] = None
+        self._partial_tr: Optional[str] = None
+
+        # 待刷新到面板的结果：最终结果按序排队，中间结果只保留最新一条
+        self._pending_finals_src = []
+        self._pending_finals_tgt = []
+        self._pending_partial_src: Optional[str] = None
+        self._pending_partial_tgt: Optional[str] = None
+        self._autoscroll_src = True
+        self._autoscroll_tgt = True
+        self._ui_timer = QTimer(self)
+        self._ui_timer.setInterval(self.PARTIAL_FLUSH_INTERVAL_MS)
+        self._ui_timer.timeout.connect(self._flush_ui)
 
         self._init_ui()
         self._connect_signals()
@@ -41,7 +86,14 @@ class MainWindow(QMainWindow):
         self.resize(ui.get("window_width", 900), ui.get("window_height", 600))
         if ui.get("always_on_top"):
             self.setWindowFlags(self.windowFlags() | Qt.WindowType.WindowStaysOnTopHint)
-        font_size = ui.get("font_size", 14)
+        # 两个面板共用一个字体对象，修改设置时只改字号
+        self._text_font = QFont("Microsoft YaHei")
+        self._text_font.setPointSize(ui.get("font_size", 14))
+        self._text_font.setStyleStrategy(
+            QFont.StyleStrategy.PreferAntialias | QFont.StyleStrategy.NoSubpixelAntialias
+        )
+        # 面板行数上限：超出后 QPlainTextEdit 自动丢弃最早的行，长会话下文档大小恒定
+        max_blocks = ui.get("max_log_blocks", 1000)
 
         central = QWidget()
         self.setCentralWidget(central)
@@ -67,13 +119,16 @@ class MainWindow(QMainWindow):
         self.device_combo.setMinimumWidth(200)
         top.addWidget(self.device_combo)
 
+        # 刷新设备列表（设备插拔后手动重新扫描）
+        self.refresh_btn = QPushButton("🔄")
+        self.refresh_btn.setFixedSize(32, 32)
+        self.refresh_btn.setToolTip("刷新设备列表")
+        top.addWidget(self.refresh_btn)
+
         # 设置按钮
         self.settings_btn = QPushButton("⚙️ 设置")
         self.settings_btn.setFixedHeight(32)
-        self.settings_btn.setStyleSheet("""
-            QPushButton { background-color: #9E9E9E; color: white; font-size: 13px; border-radius: 6px; padding: 0 14px; }
-            QPushButton:hover { background-color: #757575; }
-        """)
+        self.settings_btn.setStyleSheet(_SETTINGS_QSS)
         top.addWidget(self.settings_btn)
 
         main_layout.addLayout(top)
@@ -83,47 +138,47 @@ class MainWindow(QMainWindow):
 
         left_group = QGroupBox("📝 原文 (Source)")
         left_layout = QVBoxLayout(left_group)
-        self.source_text = QTextEdit()
+        self.source_text = QPlainTextEdit()
         self.source_text.setReadOnly(True)
-        self.source_text.setFont(QFont("Microsoft YaHei", font_size))
+        self.source_text.setFont(self._text_font)
+        self.source_text.setMaximumBlockCount(max_blocks)
+        self.source_text.setUndoRedoEnabled(False)     # 只读日志面板不需要撤销栈
         left_layout.addWidget(self.source_text)
         splitter.addWidget(left_group)
 
         right_group = QGroupBox("🌍 译文 (Translation)")
         right_layout = QVBoxLayout(right_group)
-        self.translated_text = QTextEdit()
+        self.translated_text = QPlainTextEdit()
         self.translated_text.setReadOnly(True)
-        self.translated_text.setFont(QFont("Microsoft YaHei", font_size))
+        self.translated_text.setFont(self._text_font)
+        self.translated_text.setMaximumBlockCount(max_blocks)
+        self.translated_text.setUndoRedoEnabled(False)
         right_layout.addWidget(self.translated_text)
         splitter.addWidget(right_group)
 
         main_layout.addWidget(splitter)
 
+        # 滚动条引用只取一次，滚动回调中直接使用
+        self._src_sb = self.source_text.verticalScrollBar()
+        self._tgt_sb = self.translated_text.verticalScrollBar()
+
         # === 底部按钮 ===
         bottom = QHBoxLayout()
 
         self.start_btn = QPushButton("▶️ 开始同传")
         self.start_btn.setFixedHeight(40)
-        self.start_btn.setStyleSheet("""
-            QPushButton { background-color: #4CAF50; color: white; font-size: 16px; border-radius: 8px; padding: 0 20px; }
-            QPushButton:hover { background-color: #45a049; }
-        """)
+        self.start_btn.setStyleSheet(_START_QSS)
         bottom.addWidget(self.start_btn)
 
         self.stop_btn = QPushButton("⏹️ 停止")
         self.stop_btn.setFixedHeight(40)
         self.stop_btn.setEnabled(False)
-        self.stop_btn.setStyleSheet("""
-            QPushButton { background-color: #f44336; color: white; font-size: 16px; border-radius: 8px; padding: 0 20px; }
-            QPushButton:hover { background-color: #da190b; }
-        """)
+        self.stop_btn.setStyleSheet(_STOP_QSS)
         bottom.addWidget(self.stop_btn)
 
         self.clear_btn = QPushButton("🗑️ 清空")
         self.clear_btn.setFixedHeight(40)
-        self.clear_btn.setStyleSheet("""
-            QPushButton { background-color: #607D8B; color: white; font-size: 16px; border-radius: 8px; padding: 0 20px; }
-        """)
+        self.clear_btn.setStyleSheet(_CLEAR_QSS)
         bottom.addWidget(self.clear_btn)
 
         main_layout.addLayout(bottom)
@@ -134,49 +189,94 @@ class MainWindow(QMainWindow):
         self.stop_btn.clicked.connect(self._on_stop)
         self.clear_btn.clicked.connect(self._on_clear)
         self.settings_btn.clicked.connect(self._on_settings)
+        self.refresh_btn.clicked.connect(self._on_refresh_devices)
         self.source_combo.currentIndexChanged.connect(self._refresh_device_combo)
         self.lang_selector.language_changed.connect(self._on_language_changed)
-        self.result_signal.connect(self._on_result)
-
-    def _load_devices(self):
+        # 结果由翻译线程发出，显式排队到 UI 线程的事件循环处理
+        self.result_signal.connect(self._on_result, Qt.ConnectionType.QueuedConnection)
+        self.devices_loaded.connect(self._on_devices_loaded)
+        self._src_sb.valueChanged.connect(self._on_source_scrolled)
+        self._tgt_sb.valueChanged.connect(self._on_translated_scrolled)
+
+    def _load_devices(self, announce: bool = False):
+        """在线程池中枚举音频设备，完成后通过 devices_loaded 信号回到 UI 线程"""
+        self._refresh_device_combo()    # 枚举完成前先提供默认设备
+        QThreadPool.globalInstance().start(partial(self._enumerate_devices, announce))
+
+    def _enumerate_devices(self, announce: bool):
+        """线程池中运行：驱动枚举较慢，不阻塞窗口显示"""
         try:
-            self._devices = AudioCapture.list_devices()
+            devices = AudioCapture.list_devices()
         except Exception as e:
             logger.error(f"Failed to list devices: {e}")
-            self._devices = []
+            devices = []
+        self.devices_loaded.emit(devices, announce)
+
+    @pyqtSlot(object, bool)
+    def _on_devices_loaded(self, devices: list, announce: bool):
+        self._devices = devices
+        self._mic_devices = [
+            (f"🎤 {d['name']}", d['index'])
+            for d in devices if not d.get('is_loopback') and d.get('type') == SOURCE_MIC
+        ]
+        self._loopback_devices = [(f"🔊 {d['name']}", d['index']) for d in devices if d.get('is_loopback')]
         self._refresh_device_combo()
+        if announce:
+            self.statusBar().showMessage(f"🔄 已刷新设备列表（{len(devices)} 个设备）")
 
-    def _refresh_device_combo(self):
-        source_type = self.source_combo.currentData()
-        self.device_combo.clear()
+    def _on_refresh_devices(self):
+        AudioCapture.refresh_devices()
+        self.statusBar().showMessage("🔄 正在刷新设备列表...")
+        self._load_devices(announce=True)
 
-        if source_type == SOURCE_SPEAKER:
-            self.device_combo.addItem("🔊 默认扬声器", None)
-            for d in self._devices:
-                if d.get('is_loopback'):
-                    self.device_combo.addItem(f"🔊 {d['name']}", d['index'])
+    def _refresh_device_combo(self):
+        if self.source_combo.currentData() == SOURCE_SPEAKER:
+            items = [("🔊 默认扬声器", None)] + self._loopback_devices
         else:
-            self.device_combo.addItem("🎤 默认麦克风", None)
-            for d in self._devices:
-                if not d.get('is_loopback') and d.get('type') == SOURCE_MIC:
-                    self.device_combo.addItem(f"🎤 {d['name']}", d['index'])
+            items = [("🎤 默认麦克风", None)] + self._mic_devices
+
+        self.device_combo.clear()
+        for label, index in items:
+            self.device_combo.addItem(label, index)
 
     def _on_settings(self):
-        dialog = SettingsDialog(self.config, parent=self)
+        dialog = self._settings_dialog
+        if dialog is None:
+            dialog = self._settings_dialog = SettingsDialog(self.config, parent=self)
+        else:
+            dialog.reload()
         if dialog.exec():
             new_config = dialog.get_config()
             self.config.update(new_config)
             ui = new_config.get("ui", {})
-            font_size = ui.get("font_size", 14)
-            self.source_text.setFont(QFont("Microsoft YaHei", font_size))
-            self.translated_text.setFont(QFont("Microsoft YaHei", font_size))
-            if ui.get("always_on_top"):
-                self.setWindowFlags(self.windowFlags() | Qt.WindowType.WindowStaysOnTopHint)
-            else:
-                self.setWindowFlags(self.windowFlags() & ~Qt.WindowType.WindowStaysOnTopHint)
-            self.show()
-            self.setWindowOpacity(ui.get("opacity", 0.95))
-            self.statusBar().showMessage("✅ 设置已更新")
+            self._apply_ui_settings(ui)
+            self.statusBar().showMessage("✅ 设置已保存，部分设置需要重新开始同传生效")
+
+    def _apply_ui_settings(self, ui: dict):
+        """应用界面设置：批量修改期间暂停重绘、屏蔽信号，未变化的项不重复设置"""
+        self.setUpdatesEnabled(False)
+        try:
+            with QSignalBlocker(self), QSignalBlocker(self.source_text), QSignalBlocker(self.translated_text):
+                font_size = ui.get("font_size", 14)
+                if self._text_font.pointSize() != font_size:
+                    self._text_font.setPointSize(font_size)
+                    self.source_text.setFont(self._text_font)
+                    self.translated_text.setFont(self._text_font)
+
+                max_blocks = ui.get("max_log_blocks", 1000)
+                self.source_text.setMaximumBlockCount(max_blocks)
+                self.translated_text.setMaximumBlockCount(max_blocks)
+
+                # 修改窗口标志会重建原生窗口并隐藏，只在置顶状态真正变化时才做
+                on_top = bool(ui.get("always_on_top"))
+                if on_top != bool(self.windowFlags() & Qt.WindowType.WindowStaysOnTopHint):
+                    self.setWindowFlag(Qt.WindowType.WindowStaysOnTopHint, on_top)
+                    self.show()
+
+                self.setWindowOpacity(ui.get("opacity", 0.95))
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
 
     def _on_start(self):
         if self._is_interpreting:
@@ -192,29 +292,30 @@ class MainWindow(QMainWindow):
         device_index = self.device_combo.currentData()
         target_lang = self.lang_selector.get_target_lang()
 
-        self.interpreter = Interpreter(self.config)
+        self.interpreter.remove_all_channels()
         self.interpreter.add_channel(ChannelConfig(
             name="main",
             target_lang=target_lang,
             source_type=source_type,
             device_index=device_index,
         ))
-        self.interpreter.set_result_callback(
-            lambda ch, result: self.result_signal.emit(ch, result)
-        )
 
         try:
             self.interpreter.start()
             self._is_interpreting = True
+            self._last_dropped = 0
+            self._ui_timer.start()
             self.start_btn.setEnabled(False)
             self.stop_btn.setEnabled(True)
             self.settings_btn.setEnabled(False)
             self.source_combo.setEnabled(False)
             self.device_combo.setEnabled(False)
+            self.refresh_btn.setEnabled(False)
             src = "🎤 麦克风" if source_type == SOURCE_MIC else "🔊 扬声器"
             self.statusBar().showMessage(f"🔴 同传中... ({src} → {target_lang})")
         except Exception as e:
             logger.error(f"Start failed: {e}")
+            self.interpreter.stop()
             self.statusBar().showMessage(f"❌ 启动失败: {e}")
 
     def _on_stop(self):
@@ -222,16 +323,23 @@ class MainWindow(QMainWindow):
             return
         self.interpreter.stop()
         self._is_interpreting = False
+        self._ui_timer.stop()
+        self._flush_ui()
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.settings_btn.setEnabled(True)
         self.source_combo.setEnabled(True)
         self.device_combo.setEnabled(True)
+        self.refresh_btn.setEnabled(True)
         self.statusBar().showMessage("⏹️ 已停止")
 
     def _on_clear(self):
         self.source_text.clear()
         self.translated_text.clear()
+        self._partial_src = self._partial_tr = None
+        self._pending_finals_src.clear()
+        self._pending_finals_tgt.clear()
+        self._pending_partial_src = self._pending_partial_tgt = None
 
     def _on_language_changed(self, source_lang, target_lang):
         if self._is_interpreting and self.interpreter:
@@ -239,27 +347,126 @@ class MainWindow(QMainWindow):
 
     @pyqtSlot(str, object)
     def _on_result(self, channel_name: str, result: TranslationResult):
+        """中间结果缓存后由 _flush_ui 定时写入面板，最终结果立即刷新"""
+        if result.source_text:
+            if result.is_final:
+                self._pending_finals_src.append(result.source_text)
+                self._pending_partial_src = None
+            else:
+                self._pending_partial_src = result.source_text
+        if result.translated_text:
+            if result.is_final:
+                self._pending_finals_tgt.append(result.translated_text)
+                self._pending_partial_tgt = None
+            else:
+                # 译文中间结果是增量：接在待刷新或已显示的中间结果之后
+                base = self._pending_partial_tgt
+                if base is None:
+                    base = "" if self._pending_finals_tgt else (self._partial_tr or "")
+                self._pending_partial_tgt = base + result.translated_text
+
         if result.is_final:
-            if result.source_text:
-                self.source_text.append(result.source_text)
-            if result.translated_text:
-                self.translated_text.append(result.translated_text)
-        else:
-            if result.source_text:
-                cursor = self.source_text.textCursor()
-                cursor.movePosition(QTextCursor.MoveOperation.End)
-                cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock, QTextCursor.MoveMode.KeepAnchor)
-                cursor.removeSelectedText()
-                cursor.insertText(f"💬 {result.source_text}")
-                self.source_text.setTextCursor(cursor)
-            if result.translated_text:
-                cursor = self.translated_text.textCursor()
-                cursor.movePosition(QTextCursor.MoveOperation.End)
-                cursor.insertText(result.translated_text)
-                self.translated_text.setTextCursor(cursor)
-
-        self.source_text.verticalScrollBar().setValue(self.source_text.verticalScrollBar().maximum())
-        self.translated_text.verticalScrollBar().setValue(self.translated_text.verticalScrollBar().maximum())
+            self._flush_ui()
+
+    def _flush_ui(self):
+        """把缓存的结果一次性写入面板：每个面板最多一次追加、一次改写、一次滚动"""
+        src_dirty = bool(self._pending_finals_src) or self._pending_partial_src is not None
+        tgt_dirty = bool(self._pending_finals_tgt) or self._pending_partial_tgt is not None
+        if not (src_dirty or tgt_dirty):
+            return
+        has_finals = bool(self._pending_finals_src or self._pending_finals_tgt)
+
+        if src_dirty:
+            self._partial_src = self._flush_panel(
+                self.source_text, self._pending_finals_src, self._pending_partial_src, self._partial_src, "💬 "
+            )
+            self._pending_partial_src = None
+            if self._autoscroll_src:
+                self._scroll_to_end(self.source_text)
+        if tgt_dirty:
+            self._partial_tr = self._flush_panel(
+                self.translated_text, self._pending_finals_tgt, self._pending_partial_tgt, self._partial_tr
+            )
+            self._pending_partial_tgt = None
+            if self._autoscroll_tgt:
+                self._scroll_to_end(self.translated_text)
+
+        if has_finals:
+            self._check_dropped()
+
+    def _flush_panel(self, edit: QPlainTextEdit, finals: list, partial: Optional[str],
+                     shown: Optional[str], prefix: str = "") -> Optional[str]:
+        """
+        写入一个面板：最终结果替换已显示的中间结果行并追加，随后显示最新中间结果
+        返回刷新后面板上显示的中间结果（没有则为 None）
+        """
+        replace = shown is not None
+        # 多步修改期间暂停重绘，结束后统一刷新一次
+        edit.setUpdatesEnabled(False)
+        try:
+            if finals:
+                self._write_line(edit, "\n".join(finals), replace)
+                finals.clear()
+                replace, shown = False, None
+            if partial is not None:
+                # 改写中间结果行不向外发 textChanged/cursorPositionChanged
+                with QSignalBlocker(edit):
+                    if replace:
+                        self._update_partial_line(edit, prefix, shown, partial)
+                    else:
+                        self._write_line(edit, prefix + partial, False)
+                shown = partial
+        finally:
+            edit.setUpdatesEnabled(True)
+        return shown
+
+    @staticmethod
+    def _write_line(edit: QPlainTextEdit, text: str, replace_last: bool):
+        """追加一行；replace_last 为 True 时改写最后一行（流式中间结果所在行）"""
+        if not replace_last:
+            edit.appendPlainText(text)
+            return
+        # 使用独立游标修改文档，不移动视图：是否滚动由自动滚动标志决定
+        cursor = QTextCursor(edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock, QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertText(text)
+
+    @staticmethod
+    def _update_partial_line(edit: QPlainTextEdit, prefix: str, old: str, new: str):
+        """
+        改写最后一行的中间结果：只替换与上一版不同的尾部
+        流式识别的相邻中间结果通常共享前缀，改写量从整行降为增量
+        """
+        k = len(os.path.commonprefix([old, new]))
+        cursor = QTextCursor(edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        # Qt 文本位置以 UTF-16 码元计，emoji 等非 BMP 字符占两个位置
+        offset = len((prefix + new[:k]).encode("utf-16-le")) // 2
+        cursor.setPosition(cursor.block().position() + offset)
+        cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertText(new[k:])
+
+    @staticmethod
+    def _scroll_to_end(edit: QPlainTextEdit):
+        edit.moveCursor(QTextCursor.MoveOperation.End)
+        edit.ensureCursorVisible()
+
+    def _on_source_scrolled(self, value: int):
+        # 用户向上翻看时暂停自动滚动，回到底部后恢复
+        self._autoscroll_src = value >= self._src_sb.maximum()
+
+    def _on_translated_scrolled(self, value: int):
+        self._autoscroll_tgt = value >= self._tgt_sb.maximum()
+
+    def _check_dropped(self):
+        """网络跟不上时翻译器会丢弃最旧音频，在状态栏提示"""
+        if not self.interpreter:
+            return
+        dropped = self.interpreter.dropped_frames
+        if dropped > self._last_dropped:
+            self._last_dropped = dropped
+            self.statusBar().showMessage(f"⚠️ 网络拥塞，已丢弃 {dropped} 帧音频")
 
     def closeEvent(self, event):
         if self._is_interpreting and self.interpreter:
@@ -4,15 +4,17 @@
 """
 
 import os
-import yaml
+import copy
 import logging
+from functools import partial
+from typing import Optional
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
     QLineEdit, QComboBox, QSpinBox, QDoubleSpinBox,
     QCheckBox, QPushButton, QTabWidget, QWidget,
     QLabel, QGroupBox, QMessageBox, QFileDialog
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThreadPool, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QFont
 
 logger = logging.getLogger(__name__)
@@ -21,34 +23,248 @@ logger = logging.getLogger(__name__)
 CONFIG_PATH = "config.yaml"
 USER_SETTINGS_PATH = "user_settings.yaml"
 
+DEFAULT_WS_URL = "wss://dashscope.aliyuncs.com/api-ws/v1/realtime"
+
+# 环境变量只在进程启动时读取一次，修改后需重启程序生效
+_HAS_ENV_API_KEY = bool(os.environ.get("DASHSCOPE_API_KEY"))
+
+# 保存按钮样式表：模块加载时构造一次，各次打开对话框共用
+_SAVE_QSS = (
+    "QPushButton { background-color: #2196F3; color: white; font-size: 14px; border-radius: 6px; padding: 0 24px; }"
+    "QPushButton:hover { background-color: #1976D2; }"
+)
+
+
+def _config_diff(new: dict, base: dict) -> dict:
+    """new 相对 base 的差异（嵌套 dict 逐层比较），只保留与 base 不同的项"""
+    diff = {}
+    for k, v in new.items():
+        b = base.get(k)
+        if isinstance(v, dict) and isinstance(b, dict):
+            sub = _config_diff(v, b)
+            if sub:
+                diff[k] = sub
+        elif k not in base or v != b:
+            diff[k] = v
+    return diff
+
 
 class SettingsDialog(QDialog):
     """设置对话框"""
 
+    save_finished = pyqtSignal(object, str)    # (新配置, 错误信息，成功时为空)
+
+    MODELS = (
+        "qwen3-livetranslate-flash-realtime",
+        "qwen3-livetranslate-realtime",
+    )
+    SAMPLE_RATES = (
+        (16000, "16000 Hz (推荐)"),
+        (8000, "8000 Hz (电话)"),
+    )
+    AUDIO_FORMATS = ("pcm", "wav", "opus", "mp3")
+
+    # 值 → 下拉框索引，加载配置时一次字典查找代替逐项比较
+    _MODEL_INDEX = {name: i for i, name in enumerate(MODELS)}
+    _SAMPLE_RATE_INDEX = {sr: i for i, (sr, _) in enumerate(SAMPLE_RATES)}
+    _AUDIO_FORMAT_INDEX = {fmt: i for i, fmt in enumerate(AUDIO_FORMATS)}
+
+    # 配置缺项时的默认值，加载时与配置节合并一次，之后直接按键取值
+    _DEFAULTS = {
+        "dashscope": {"api_key": "", "websocket_url": DEFAULT_WS_URL},
+        "model": {
+            "name": MODELS[0],
+            "vad_enabled": True,
+            "vad_threshold": 0.0,
+            "vad_silence_duration_ms": 400,
+        },
+        "audio": {"sample_rate": 16000, "format": "pcm", "block_size": 3200},
+        "ui": {
+            "font_size": 14,
+            "max_log_blocks": 1000,
+            "always_on_top": False,
+            "opacity": 0.95,
+            "window_width": 900,
+            "window_height": 600,
+        },
+    }
+
+    # 数值/开关类配置项：配置节 → ((控件属性名, 控件类, 表单标签, 配置键, 控件参数), ...)
+    # 构建、加载、收集都遍历这张表
+    _FIELDS = {
+        "model": (
+            ("vad_enabled", QCheckBox, "", "vad_enabled", {"text": "启用服务端 VAD"}),
+            ("vad_threshold", QDoubleSpinBox, "检测阈值:", "vad_threshold", {"range": (-1.0, 1.0), "step": 0.1}),
+            ("vad_silence", QSpinBox, "断句静音时长:", "vad_silence_duration_ms",
+             {"range": (200, 6000), "step": 100, "suffix": " ms"}),
+        ),
+        "audio": (
+            ("block_size_spin", QSpinBox, "缓冲帧数:", "block_size", {"range": (1600, 16000), "step": 1600}),
+        ),
+        "ui": (
+            ("font_size_spin", QSpinBox, "字体大小:", "font_size", {"range": (10, 30)}),
+            ("max_log_blocks_spin", QSpinBox, "最多保留行数:", "max_log_blocks", {"range": (100, 100000), "step": 100}),
+            ("always_on_top_cb", QCheckBox, "", "always_on_top", {"text": "窗口置顶"}),
+            ("opacity_spin", QDoubleSpinBox, "窗口透明度:", "opacity", {"range": (0.3, 1.0), "step": 0.05}),
+        ),
+    }
+
+    # 占位符/提示文字表：按 Tab 顺序分组的 (控件属性名, 文字)，构建该页后统一设置
+    _PLACEHOLDERS = (
+        (
+            ("api_key_edit", "sk-xxxxxxxx 或设置环境变量 DASHSCOPE_API_KEY"),
+            ("ws_url_edit", DEFAULT_WS_URL),
+        ),
+        (),
+        (),
+    )
+    _TOOLTIPS = (
+        (
+            ("vad_threshold", "越低越灵敏，可能误触；越高越稳，可能漏检"),
+            ("vad_silence", "静音多久算断句，越小响应越快但可能断句不自然"),
+        ),
+        (
+            ("block_size_spin", "每次发送的帧数，3200≈100ms"),
+        ),
+        (
+            ("max_log_blocks_spin", "原文/译文面板最多保留的行数，超出后丢弃最早的行"),
+        ),
+    )
+
     def __init__(self, config: dict, parent=None):
         super().__init__(parent)
         self.config = config
+        self._msgbox: Optional[QMessageBox] = None    # 提示框首次使用时创建，之后复用
+        self._saving = False    # 后台保存进行中：期间不允许取消/关闭对话框
         self._init_ui()
-        self._load_from_config()
+        # 控件当前所反映的配置快照；对话框复用时配置未变就不必重新填充
+        self._loaded_config = copy.deepcopy(config)
+
+    def reload(self):
+        """复用对话框再次打开前调用：配置有变化或上次取消了编辑时，重新填充已构建的 Tab"""
+        if self._loaded_config == self.config:
+            return
+        for built, (_, load) in zip(self._tab_built, self._tab_builders):
+            if built:
+                load()
+        self._loaded_config = copy.deepcopy(self.config)
+
+    def reject(self):
+        if self._saving:
+            return      # 保存完成前忽略 Esc，结果由 _on_save_finished 处理
+        # 取消时控件里可能留有未保存的修改，下次打开必须重新填充
+        self._loaded_config = None
+        super().reject()
+
+    def closeEvent(self, event):
+        if self._saving:
+            event.ignore()
+            return
+        super().closeEvent(event)
 
     def _init_ui(self):
         self.setWindowTitle("⚙️ 设置")
         self.setMinimumSize(550, 480)
         layout = QVBoxLayout(self)
 
-        # Tab 页
+        # Tab 页：先放空白页，首次切换到某页时才构建控件并填充配置
         tabs = QTabWidget()
+        self._tab_builders = (
+            (self._build_model_tab, self._load_model_config),
+            (self._build_audio_tab, self._load_audio_config),
+            (self._build_ui_tab, self._load_ui_config),
+        )
+        self._tab_pages = [QWidget() for _ in self._tab_builders]
+        self._tab_built = [False] * len(self._tab_builders)
+        self._getters = {}     # 配置节 → ((配置键, 控件取值方法), ...)，构建控件时绑定
+        tabs.addTab(self._tab_pages[0], "🤖 AI 模型")
+        tabs.addTab(self._tab_pages[1], "🔊 音频")
+        tabs.addTab(self._tab_pages[2], "💻 界面")
+        tabs.currentChanged.connect(self._ensure_tab_built)
+        self._ensure_tab_built(0)
+
+        layout.addWidget(tabs)
+
+        # === 底部按钮 ===
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
 
-        # === Tab 1: AI 模型 ===
-        model_tab = QWidget()
-        model_layout = QVBoxLayout(model_tab)
+        self.save_btn = QPushButton("💾 保存")
+        self.save_btn.setFixedHeight(36)
+        self.save_btn.setStyleSheet(_SAVE_QSS)
+        self.save_btn.clicked.connect(self._on_save)
+        self.save_finished.connect(self._on_save_finished)
+        btn_layout.addWidget(self.save_btn)
+
+        self.cancel_btn = QPushButton("取消")
+        self.cancel_btn.setFixedHeight(36)
+        self.cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(self.cancel_btn)
+
+        layout.addLayout(btn_layout)
+
+    @pyqtSlot(int)
+    def _ensure_tab_built(self, index: int):
+        """首次显示某个 Tab 时构建其控件并从配置填充"""
+        if index < 0 or self._tab_built[index]:
+            return
+        build, load = self._tab_builders[index]
+        build(self._tab_pages[index])
+        for name, text in self._PLACEHOLDERS[index]:
+            getattr(self, name).setPlaceholderText(text)
+        for name, text in self._TOOLTIPS[index]:
+            getattr(self, name).setToolTip(text)
+        load()
+        self._tab_built[index] = True
+
+    @staticmethod
+    def _make_field(widget_cls, opts: dict):
+        """按 _FIELDS 中的参数创建控件"""
+        widget = widget_cls(opts["text"]) if "text" in opts else widget_cls()
+        if "range" in opts:
+            widget.setRange(*opts["range"])
+        if "step" in opts:
+            widget.setSingleStep(opts["step"])
+        if "suffix" in opts:
+            widget.setSuffix(opts["suffix"])
+        return widget
+
+    def _add_fields(self, form: QFormLayout, section: str):
+        """创建某配置节的全部数值/开关控件并加入表单"""
+        getters = []
+        for attr, widget_cls, label, key, opts in self._FIELDS[section]:
+            widget = self._make_field(widget_cls, opts)
+            setattr(self, attr, widget)
+            form.addRow(label, widget)
+            getters.append((key, widget.isChecked if widget_cls is QCheckBox else widget.value))
+        self._getters[section] = tuple(getters)
+
+    def _section(self, section: str) -> dict:
+        """配置节与默认值合并后的结果"""
+        return {**self._DEFAULTS[section], **self.config.get(section, {})}
+
+    def _load_fields(self, section: str, values: dict):
+        """从（已合并默认值的）配置节填充数值/开关控件"""
+        for attr, widget_cls, _, key, _ in self._FIELDS[section]:
+            value = values[key]
+            if widget_cls is QCheckBox:
+                getattr(self, attr).setChecked(value)
+            else:
+                getattr(self, attr).setValue(value)
+
+    def _collect_fields(self, section: str) -> dict:
+        """收集某配置节的数值/开关控件的值"""
+        return {key: get() for key, get in self._getters[section]}
+
+    def _build_model_tab(self, page: QWidget):
+        """Tab 1: AI 模型"""
+        model_layout = QVBoxLayout(page)
 
         # API Key
         api_group = QGroupBox("🔑 百炼 API 配置")
         api_form = QFormLayout(api_group)
 
         self.api_key_edit = QLineEdit()
-        self.api_key_edit.setPlaceholderText("sk-xxxxxxxx 或设置环境变量 DASHSCOPE_API_KEY")
         self.api_key_edit.setEchoMode(QLineEdit.EchoMode.Password)
         api_form.addRow("API Key:", self.api_key_edit)
 
@@ -59,7 +275,6 @@ class SettingsDialog(QDialog):
         api_form.addRow("", self.show_key_btn)
 
         self.ws_url_edit = QLineEdit()
-        self.ws_url_edit.setPlaceholderText("wss://dashscope.aliyuncs.com/api-ws/v1/realtime")
         api_form.addRow("WebSocket URL:", self.ws_url_edit)
 
         model_layout.addWidget(api_group)
@@ -70,10 +285,7 @@ class SettingsDialog(QDialog):
 
         self.model_combo = QComboBox()
         self.model_combo.setEditable(True)
-        self.model_combo.addItems([
-            "qwen3-livetranslate-flash-realtime",
-            "qwen3-livetranslate-realtime",
-        ])
+        self.model_combo.addItems(self.MODELS)
         model_form.addRow("ASR+翻译模型:", self.model_combo)
 
         model_layout.addWidget(model_group)
@@ -82,110 +294,46 @@ class SettingsDialog(QDialog):
         vad_group = QGroupBox("🎙️ VAD 语音检测")
         vad_form = QFormLayout(vad_group)
 
-        self.vad_enabled = QCheckBox("启用服务端 VAD")
-        self.vad_enabled.setChecked(True)
-        vad_form.addRow("", self.vad_enabled)
-
-        self.vad_threshold = QDoubleSpinBox()
-        self.vad_threshold.setRange(-1.0, 1.0)
-        self.vad_threshold.setSingleStep(0.1)
-        self.vad_threshold.setValue(0.0)
-        self.vad_threshold.setToolTip("越低越灵敏，可能误触；越高越稳，可能漏检")
-        vad_form.addRow("检测阈值:", self.vad_threshold)
-
-        self.vad_silence = QSpinBox()
-        self.vad_silence.setRange(200, 6000)
-        self.vad_silence.setSingleStep(100)
-        self.vad_silence.setValue(400)
-        self.vad_silence.setSuffix(" ms")
-        self.vad_silence.setToolTip("静音多久算断句，越小响应越快但可能断句不自然")
-        vad_form.addRow("断句静音时长:", self.vad_silence)
+        self._add_fields(vad_form, "model")
 
         model_layout.addWidget(vad_group)
         model_layout.addStretch()
-        tabs.addTab(model_tab, "🤖 AI 模型")
 
-        # === Tab 2: 音频 ===
-        audio_tab = QWidget()
-        audio_layout = QVBoxLayout(audio_tab)
+    def _build_audio_tab(self, page: QWidget):
+        """Tab 2: 音频"""
+        audio_layout = QVBoxLayout(page)
 
         audio_group = QGroupBox("🔊 音频参数")
         audio_form = QFormLayout(audio_group)
 
         self.sample_rate_combo = QComboBox()
-        self.sample_rate_combo.addItem("16000 Hz (推荐)", 16000)
-        self.sample_rate_combo.addItem("8000 Hz (电话)", 8000)
+        for sr, label in self.SAMPLE_RATES:
+            self.sample_rate_combo.addItem(label, sr)
         audio_form.addRow("采样率:", self.sample_rate_combo)
 
         self.audio_format_combo = QComboBox()
-        self.audio_format_combo.addItems(["pcm", "wav", "opus", "mp3"])
+        self.audio_format_combo.addItems(self.AUDIO_FORMATS)
         audio_form.addRow("音频格式:", self.audio_format_combo)
 
-        self.block_size_spin = QSpinBox()
-        self.block_size_spin.setRange(1600, 16000)
-        self.block_size_spin.setSingleStep(1600)
-        self.block_size_spin.setValue(3200)
-        self.block_size_spin.setToolTip("每次发送的帧数，3200≈100ms")
-        audio_form.addRow("缓冲帧数:", self.block_size_spin)
+        self._add_fields(audio_form, "audio")
 
         audio_layout.addWidget(audio_group)
         audio_layout.addStretch()
-        tabs.addTab(audio_tab, "🔊 音频")
 
-        # === Tab 3: 界面 ===
-        ui_tab = QWidget()
-        ui_layout = QVBoxLayout(ui_tab)
+    def _build_ui_tab(self, page: QWidget):
+        """Tab 3: 界面"""
+        ui_layout = QVBoxLayout(page)
 
         ui_group = QGroupBox("💻 界面设置")
         ui_form = QFormLayout(ui_group)
 
-        self.font_size_spin = QSpinBox()
-        self.font_size_spin.setRange(10, 30)
-        self.font_size_spin.setValue(14)
-        ui_form.addRow("字体大小:", self.font_size_spin)
-
-        self.always_on_top_cb = QCheckBox("窗口置顶")
-        ui_form.addRow("", self.always_on_top_cb)
-
-        self.opacity_spin = QDoubleSpinBox()
-        self.opacity_spin.setRange(0.3, 1.0)
-        self.opacity_spin.setSingleStep(0.05)
-        self.opacity_spin.setValue(0.95)
-        ui_form.addRow("窗口透明度:", self.opacity_spin)
+        self._add_fields(ui_form, "ui")
 
         ui_layout.addWidget(ui_group)
         ui_layout.addStretch()
-        tabs.addTab(ui_tab, "💻 界面")
-
-        layout.addWidget(tabs)
-
-        # === 底部按钮 ===
-        btn_layout = QHBoxLayout()
-        btn_layout.addStretch()
-
-        self.save_btn = QPushButton("💾 保存")
-        self.save_btn.setFixedHeight(36)
-        self.save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                font-size: 14px;
-                border-radius: 6px;
-                padding: 0 24px;
-            }
-            QPushButton:hover { background-color: #1976D2; }
-        """)
-        self.save_btn.clicked.connect(self._on_save)
-        btn_layout.addWidget(self.save_btn)
-
-        self.cancel_btn = QPushButton("取消")
-        self.cancel_btn.setFixedHeight(36)
-        self.cancel_btn.clicked.connect(self.reject)
-        btn_layout.addWidget(self.cancel_btn)
-
-        layout.addLayout(btn_layout)
 
-    def _toggle_key_visibility(self, checked):
+    @pyqtSlot(bool)
+    def _toggle_key_visibility(self, checked: bool):
         if checked:
             self.api_key_edit.setEchoMode(QLineEdit.EchoMode.Normal)
             self.show_key_btn.setText("🙈 隐藏")
@@ -193,94 +341,150 @@ class SettingsDialog(QDialog):
             self.api_key_edit.setEchoMode(QLineEdit.EchoMode.Password)
             self.show_key_btn.setText("👁 显示")
 
-    def _load_from_config(self):
-        """从配置加载到 UI"""
-        ds = self.config.get("dashscope", {})
-        self.api_key_edit.setText(ds.get("api_key", ""))
-        self.ws_url_edit.setText(ds.get("websocket_url", "wss://dashscope.aliyuncs.com/api-ws/v1/realtime"))
+    def _load_model_config(self):
+        """从配置加载 AI 模型页"""
+        ds = self._section("dashscope")
+        self.api_key_edit.setText(ds["api_key"])
+        self.ws_url_edit.setText(ds["websocket_url"])
 
-        model = self.config.get("model", {})
-        model_name = model.get("name", "qwen3-livetranslate-flash-realtime")
-        idx = self.model_combo.findText(model_name)
-        if idx >= 0:
+        model = self._section("model")
+        model_name = model["name"]
+        idx = self._MODEL_INDEX.get(model_name)
+        if idx is not None:
             self.model_combo.setCurrentIndex(idx)
         else:
             self.model_combo.setCurrentText(model_name)
 
-        self.vad_enabled.setChecked(model.get("vad_enabled", True))
-        self.vad_threshold.setValue(model.get("vad_threshold", 0.0))
-        self.vad_silence.setValue(model.get("vad_silence_duration_ms", 400))
+        self._load_fields("model", model)
 
-        audio = self.config.get("audio", {})
-        sr = audio.get("sample_rate", 16000)
-        for i in range(self.sample_rate_combo.count()):
-            if self.sample_rate_combo.itemData(i) == sr:
-                self.sample_rate_combo.setCurrentIndex(i)
-                break
+    def _load_audio_config(self):
+        """从配置加载音频页"""
+        audio = self._section("audio")
+        idx = self._SAMPLE_RATE_INDEX.get(audio["sample_rate"])
+        if idx is not None:
+            self.sample_rate_combo.setCurrentIndex(idx)
 
-        fmt = audio.get("format", "pcm")
-        idx = self.audio_format_combo.findText(fmt)
-        if idx >= 0:
+        idx = self._AUDIO_FORMAT_INDEX.get(audio["format"])
+        if idx is not None:
             self.audio_format_combo.setCurrentIndex(idx)
 
-        self.block_size_spin.setValue(audio.get("block_size", 3200))
+        self._load_fields("audio", audio)
 
-        ui = self.config.get("ui", {})
-        self.font_size_spin.setValue(ui.get("font_size", 14))
-        self.always_on_top_cb.setChecked(ui.get("always_on_top", False))
-        self.opacity_spin.setValue(ui.get("opacity", 0.95))
+    def _load_ui_config(self):
+        """从配置加载界面页"""
+        self._load_fields("ui", self._section("ui"))
 
     def get_config(self) -> dict:
-        """从 UI 收集配置"""
+        """从 UI 收集配置（未打开过的 Tab 沿用原配置）"""
+        model_built, audio_built, ui_built = self._tab_built
+        ui = self._section("ui")
         return {
             "dashscope": {
+                **self.config.get("dashscope", {}),
                 "api_key": self.api_key_edit.text().strip(),
-                "websocket_url": self.ws_url_edit.text().strip() or "wss://dashscope.aliyuncs.com/api-ws/v1/realtime",
-            },
+                "websocket_url": self.ws_url_edit.text().strip() or DEFAULT_WS_URL,
+            } if model_built else dict(self.config.get("dashscope", {})),
             "model": {
                 "name": self.model_combo.currentText().strip(),
-                "vad_enabled": self.vad_enabled.isChecked(),
-                "vad_threshold": self.vad_threshold.value(),
-                "vad_silence_duration_ms": self.vad_silence.value(),
-            },
+                **self._collect_fields("model"),
+            } if model_built else dict(self.config.get("model", {})),
             "audio": {
-                "sample_rate": self.sample_rate_combo.currentData() or 16000,
+                "sample_rate": self.sample_rate_combo.currentData() or self._DEFAULTS["audio"]["sample_rate"],
                 "channels": 1,
                 "format": self.audio_format_combo.currentText(),
-                "block_size": self.block_size_spin.value(),
-            },
+                **self._collect_fields("audio"),
+            } if audio_built else dict(self.config.get("audio", {})),
             "ui": {
-                "font_size": self.font_size_spin.value(),
-                "always_on_top": self.always_on_top_cb.isChecked(),
-                "opacity": self.opacity_spin.value(),
-                "window_width": self.config.get("ui", {}).get("window_width", 900),
-                "window_height": self.config.get("ui", {}).get("window_height", 600),
-            },
+                **self._collect_fields("ui"),
+                "window_width": ui["window_width"],
+                "window_height": ui["window_height"],
+            } if ui_built else dict(self.config.get("ui", {})),
             "languages": self.config.get("languages", {}),
         }
 
+    @pyqtSlot()
     def _on_save(self):
         """保存配置"""
         new_config = self.get_config()
 
         # 验证 API Key
         api_key = new_config["dashscope"]["api_key"]
-        if not api_key and not os.environ.get("DASHSCOPE_API_KEY"):
-            QMessageBox.warning(self, "提示", "请填写百炼 API Key 或设置环境变量 DASHSCOPE_API_KEY")
+        if not api_key and not _HAS_ENV_API_KEY:
+            self._show_message(QMessageBox.Icon.Warning, "提示",
+                               "请填写百炼 API Key 或设置环境变量 DASHSCOPE_API_KEY（设置后需重启程序）")
             return
 
-        # 保存到 user_settings.yaml
+        # 序列化和写盘放到线程池，完成后通过 save_finished 信号回到 UI 线程
+        self._saving = True
+        self.save_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(False)
+        QThreadPool.globalInstance().start(partial(self._write_settings, new_config))
+
+    def _write_settings(self, new_config: dict):
+        """线程池中运行：保存到 user_settings.yaml"""
+        # yaml 只在保存时才用到，延迟导入
+        import yaml
+        from core.config import load_yaml
         try:
-            with open(USER_SETTINGS_PATH, "w", encoding="utf-8") as f:
-                yaml.dump(new_config, f, allow_unicode=True, default_flow_style=False)
-            logger.info(f"Settings saved to {USER_SETTINGS_PATH}")
+            from yaml import CSafeDumper as _YamlDumper
+        except ImportError:  # PyYAML 未编译 libyaml 时使用纯 Python 序列化器
+            from yaml import SafeDumper as _YamlDumper
+
+        # user_settings.yaml 只记录与 config.yaml 不同的项；内容没变就不写盘，
+        # 避免无谓 I/O 以及 mtime 变化导致 load_yaml 的解析缓存失效
+        try:
+            overlay = _config_diff(new_config, load_yaml(CONFIG_PATH))
+            unchanged = overlay == load_yaml(USER_SETTINGS_PATH)
         except Exception as e:
-            logger.error(f"Save settings failed: {e}")
-            QMessageBox.critical(self, "错误", f"保存失败: {e}")
+            logger.warning("Compare settings failed, writing anyway: %s", e)
+            overlay, unchanged = new_config, False
+        if unchanged:
+            logger.info("Settings unchanged; skipping write")
+            self.save_finished.emit(new_config, "")
+            return
+
+        # 先写临时文件再原子替换，中途崩溃或磁盘写满也不会留下半截的设置文件
+        tmp = USER_SETTINGS_PATH + ".tmp"
+        try:
+            # 二进制模式 + encoding：由 libyaml 直接输出 UTF-8 字节，省去文本层再编码
+            with open(tmp, "wb") as f:
+                yaml.dump(overlay, f, Dumper=_YamlDumper, allow_unicode=True, encoding="utf-8",
+                          default_flow_style=False, sort_keys=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, USER_SETTINGS_PATH)
+            logger.info("Settings saved to %s", USER_SETTINGS_PATH)
+        except Exception as e:
+            logger.error("Save settings failed: %s", e)
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            self.save_finished.emit(new_config, str(e))
+            return
+
+        self.save_finished.emit(new_config, "")
+
+    @pyqtSlot(object, str)
+    def _on_save_finished(self, new_config: dict, error: str):
+        self._saving = False
+        self.save_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(True)
+        if error:
+            self._show_message(QMessageBox.Icon.Critical, "错误", f"保存失败: {error}")
             return
 
         # 更新内存中的配置
         self.config.update(new_config)
-
-        QMessageBox.information(self, "成功", "设置已保存！\n部分设置需要重新开始同传生效。")
+        self._loaded_config = copy.deepcopy(self.config)
+        # 保存成功不再弹模态框，由主窗口在状态栏提示
         self.accept()
+
+    def _show_message(self, icon: QMessageBox.Icon, title: str, text: str):
+        """复用同一个提示框显示警告/错误"""
+        if self._msgbox is None:
+            self._msgbox = QMessageBox(self)
+        self._msgbox.setIcon(icon)
+        self._msgbox.setWindowTitle(title)
+        self._msgbox.setText(text)
+        self._msgbox.exec()